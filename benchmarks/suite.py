@@ -0,0 +1,316 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+from envs.constants import config
+from envs.grid import Grid
+from envs.ui.training_room import TrainingRoom
+from envs.ui.play_room import PlayRoom
+from envs.ui.procedural_room import ProceduralRoom
+from q_learning.parallel import PRESET_FIRE_POSITIONS
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+SEED = 0
+REPEATS = 3
+TOLERANCE = 0.25  # relative slowdown or memory growth flagged as regression
+TIME_SLACK = 0.001  # seconds, timer noise on sub-millisecond results
+MDP_MAX_GRID_SIZE = 16  # the state space grows with positions squared
+
+BENCHMARK_CONFIG = config.replace(is_rendering=False, static_fire_mode=False)
+
+
+class Scenario:
+    """
+    A room and grid size. `room` builds a new factory every time, so a
+    generated room starts from the same plan in every benchmark.
+
+    Every episode starts with three tiles on fire, the given
+    `fire_positions` or else three free tiles of the room it is played in.
+    """
+
+    def __init__(self, name, room, grid_size, fire_positions=None):
+        self.name = name
+        self.room = room
+        self.config = BENCHMARK_CONFIG.replace(grid_size=grid_size)
+        self.fire_positions = fire_positions
+
+    def pick_fire_positions(self, free: np.ndarray) -> list[tuple[int, int]]:
+        if self.fire_positions is not None:
+            return self.fire_positions
+
+        picks = np.random.default_rng(SEED).choice(
+            np.flatnonzero(free), 3, replace=False
+        )
+        return [tuple(map(int, np.unravel_index(i, free.shape))) for i in picks]
+
+    def layout(self) -> Grid:
+        """The room the MDP of the scenario is built on."""
+        return Grid(
+            self.room(), np_random=np.random.default_rng(SEED), config=self.config
+        )
+
+    def reset(self, env, seed=None):
+        """
+        Resets a FireFighterWorld and sets fire to the scenario's tiles, or
+        to three free tiles of the new room away from the characters.
+        """
+        if self.fire_positions is not None:
+            options = {"preset_fire_positions": self.fire_positions}
+            return env.reset(seed=seed, options=options)
+
+        observation = env.reset(seed=seed, options={})
+        grid = env.grid
+        free = grid.traversable.copy()
+        free[tuple(grid.agent.location)] = False
+        free[tuple(grid.target.location)] = False
+        for pos in self.pick_fire_positions(free):
+            grid.on_fire[pos] = True
+
+        return observation
+
+
+SCENARIOS = [
+    Scenario("training_room", TrainingRoom, 6, PRESET_FIRE_POSITIONS),
+    Scenario("play_room", PlayRoom, 8),
+    Scenario("generated_16", lambda: ProceduralRoom(seed=SEED), 16),
+    Scenario("generated_32", lambda: ProceduralRoom(seed=SEED), 32),
+    Scenario("generated_128", lambda: ProceduralRoom(seed=SEED), 128),
+]
+
+
+# Every benchmark sets itself up and returns the units of work it measured
+# and the seconds they took, setup is not timed. A unit ending in "/s" is a
+# rate (higher is better), "s" the seconds per run.
+
+
+def bench_env_step(scenario: Scenario, n=5_000):
+    from envs.grid_world import FireFighterWorld
+
+    env = FireFighterWorld(room_factory=scenario.room(), config=scenario.config)
+    scenario.reset(env, seed=SEED)
+    actions = np.random.default_rng(SEED).integers(env.action_space.n, size=n)
+
+    started = time.perf_counter()
+    for action in actions:
+        _, _, terminated, _, _ = env.step(action)
+        if terminated:
+            scenario.reset(env)
+
+    return n, time.perf_counter() - started
+
+
+def bench_env_reset(scenario: Scenario, n=500):
+    from envs.grid_world import FireFighterWorld
+
+    env = FireFighterWorld(room_factory=scenario.room(), config=scenario.config)
+    scenario.reset(env, seed=SEED)
+
+    started = time.perf_counter()
+    for _ in range(n):
+        scenario.reset(env)
+
+    return n, time.perf_counter() - started
+
+
+def bench_batch_step(scenario: Scenario, n=200, num_envs=256):
+    from envs.grid_world_batch import FireFighterWorldBatch
+
+    env = FireFighterWorldBatch(
+        num_envs, room_factory=scenario.room(), config=scenario.config
+    )
+    # all envs of the batch share one room
+    env.reset(seed=SEED)
+    fire_positions = scenario.pick_fire_positions(env.traversable)
+    options = {"preset_fire_positions": fire_positions}
+    env.reset(options=options)
+    actions = np.random.default_rng(SEED).integers(5, size=(n, num_envs))
+
+    started = time.perf_counter()
+    for step_actions in actions:
+        _, _, terminated, _, _ = env.step(step_actions)
+        env.reset(options={**options, "mask": terminated})
+
+    return n * num_envs, time.perf_counter() - started
+
+
+def bench_agent_update(scenario: Scenario, n=20_000):
+    from envs.constants import Action
+    from envs.utilities import ObservationEncoder
+    from q_learning.agent import Agent
+
+    num_states = ObservationEncoder(scenario.config.grid_size).num_states
+    agent = Agent(
+        q_table=np.zeros((num_states, len(Action))),
+        learning_rate=0.1,
+        debug=False,
+        config=scenario.config,
+    )
+    rng = np.random.default_rng(SEED)
+    states = rng.integers(agent.encoder.num_states, size=(n, 2))
+    actions = rng.integers(agent.q_table.shape[1], size=n)
+    rewards = rng.normal(size=n)
+
+    started = time.perf_counter()
+    for (state, next_state), action, reward in zip(states, actions, rewards):
+        agent.update(int(state), action, reward, False, int(next_state))
+
+    return n, time.perf_counter() - started
+
+
+def _build_mdp(scenario: Scenario):
+    # the solver reports its progress on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        from mdp import FireEvacuationAgentMDP
+
+        return FireEvacuationAgentMDP(
+            seed=SEED,
+            preset_fire_positions=scenario.pick_fire_positions(
+                scenario.layout().traversable
+            ),
+            cache_dir=None,
+            config=scenario.config,
+            room_factory=scenario.room(),
+        )
+
+
+def bench_mdp_build(scenario: Scenario):
+    mdp = _build_mdp(scenario)
+    started = time.perf_counter()
+    mdp._build_model()
+    return 1, time.perf_counter() - started
+
+
+def bench_mdp_solve(scenario: Scenario):
+    mdp = _build_mdp(scenario)
+    mdp.value_function = np.zeros(mdp.num_states)
+    with contextlib.redirect_stdout(io.StringIO()):
+        mdp.solve()
+    return 1, mdp.solve_report["wall_time"]
+
+
+BENCHMARKS = {
+    "env_step": (bench_env_step, "steps/s"),
+    "env_reset": (bench_env_reset, "resets/s"),
+    "batch_step": (bench_batch_step, "steps/s"),
+    "agent_update": (bench_agent_update, "updates/s"),
+    "mdp_build": (bench_mdp_build, "s"),
+    "mdp_solve": (bench_mdp_solve, "s"),
+}
+
+
+def applies(benchmark: str, scenario: Scenario) -> bool:
+    if benchmark.startswith("mdp_"):
+        return scenario.config.grid_size <= MDP_MAX_GRID_SIZE
+    if benchmark == "agent_update":
+        # the q-table only depends on the grid size
+        return scenario.name == "training_room"
+    return True
+
+
+def measure(benchmark: str, scenario: Scenario, repeats=REPEATS) -> dict:
+    """
+    Best of `repeats` runs, then one more run under tracemalloc for the
+    peak memory, so tracing does not slow down the timed runs.
+    """
+    function, unit = BENCHMARKS[benchmark]
+
+    values = []
+    for _ in range(repeats):
+        work, seconds = function(scenario)
+        values.append(work / seconds if unit.endswith("/s") else seconds / work)
+
+    tracemalloc.start()
+    function(scenario)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "value": max(values) if unit.endswith("/s") else min(values),
+        "unit": unit,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def regressions(name: str, result: dict, baseline: dict, tolerance: float):
+    found = []
+    if result["unit"].endswith("/s"):
+        if result["value"] < baseline["value"] * (1 - tolerance):
+            found.append(f"{name}: {result['value']:.4g} < {baseline['value']:.4g}")
+    elif result["value"] > baseline["value"] * (1 + tolerance) + TIME_SLACK:
+        found.append(f"{name}: {result['value']:.4g} > {baseline['value']:.4g}")
+
+    # small allocations vary between runs, only growth above 1 MB counts
+    if result["peak_mb"] > baseline["peak_mb"] * (1 + tolerance) + 1:
+        found.append(
+            f"{name}: peak {result['peak_mb']:.1f} MB > {baseline['peak_mb']:.1f} MB"
+        )
+
+    return found
+
+
+def run(selected=None, repeats=REPEATS) -> dict[str, dict]:
+    results = {}
+    for scenario in SCENARIOS:
+        for benchmark in BENCHMARKS:
+            name = f"{scenario.name}/{benchmark}"
+            if not applies(benchmark, scenario):
+                continue
+            if selected and not any(part in name for part in selected):
+                continue
+
+            results[name] = measure(benchmark, scenario, repeats)
+            print(
+                f"{name:<32} {results[name]['value']:>12.4g} "
+                f"{results[name]['unit']:<10} peak {results[name]['peak_mb']:.1f} MB"
+            )
+
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the env, the MDP solver and the agent and "
+        "compares the results with the stored baselines."
+    )
+    parser.add_argument("selected", nargs="*", help="only names containing one")
+    parser.add_argument("--save", action="store_true", help="store as baselines")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run(args.selected, args.repeats)
+
+    baselines = {}
+    if os.path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE) as file:
+            baselines = json.load(file)
+
+    if args.save:
+        baselines.update(results)
+        with open(BASELINES_FILE, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Saved {len(results)} baselines to {BASELINES_FILE}")
+        return 0
+
+    found = []
+    for name, result in results.items():
+        if name in baselines:
+            found += regressions(name, result, baselines[name], args.tolerance)
+        else:
+            print(f"{name}: no baseline")
+
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    print(f"{len(found)} regressions in {len(results)} benchmarks")
+
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,6 @@ import numpy as np
 from q_learning.agent import Agent
 from q_learning.constants import RENDER, MAX_STEPS_PER_EPISODE
 from envs.constants import config
-from envs.ui.sprites import load_srpite_map
 from mdp import FireEvacuationAgentMDP
 
 
@@ -14,7 +13,11 @@ def create_env():
         entry_point="envs:FireFighterWorld",
     )
 
-    env = gym.make("FireFighterWorld", render_mode="human" if RENDER else "rgb_array")
+    env = gym.make(
+        "FireFighterWorld",
+        render_mode="human" if RENDER else None,
+        config=config,
+    )
     env.reset(seed=42, options={"preset_fire_positions": [(3, 2)]})
 
     return env
@@ -45,10 +48,9 @@ class Metrics:
         self.is_successful = False
 
 
-config.static_fire_mode = True
-# config.random_target_location = False
+config = config.replace(static_fire_mode=True)
+# config = config.replace(random_target_location=False)
 
-load_srpite_map()
 
 
 preset_fire_positions = [
@@ -72,9 +74,9 @@ unavailable = [
 
 unavailable += preset_fire_positions
 
-q_learning_agent = Agent(seed=42)
+q_learning_agent = Agent(seed=42, config=config)
 q_metrics = Metrics()
-mdp_agent = FireEvacuationAgentMDP(seed=42)
+mdp_agent = FireEvacuationAgentMDP(seed=42, config=config)
 mdp_metrics = Metrics()
 
 
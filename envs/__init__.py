@@ -1,4 +1,17 @@
 from envs.grid_world import FireFighterWorld
-from envs.tiles.floor import Floor
-from envs.tiles.tile import Tile
+from envs.grid_world_batch import FireFighterWorldBatch
 from envs.constants import *
+
+
+def __getattr__(name):
+    # the tile views need pygame, import them only when asked for
+    if name == "Floor":
+        from envs.tiles.floor import Floor
+
+        return Floor
+    if name == "Tile":
+        from envs.tiles.tile import Tile
+
+        return Tile
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
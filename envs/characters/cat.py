@@ -1,17 +1,16 @@
 # envs/characters/cat.py
 
 import numpy as np
-from envs.constants import config
-from envs.ui.sprites import sprite_map
+from envs.constants import Config, config
 from envs.tiles.base import Base
 
 
 class Cat(Base):
     _anim_state = 0
 
-    def __init__(self, location: np.ndarray):
+    def __init__(self, location: np.ndarray, config: Config = config):
         self.location = location
-        self._state_count = len(sprite_map["cat"])
+        self.config = config
         self._current_sprite_key = "idle"  # Default sprite key
 
         self._anim_state = 0  # Current frame of animation
@@ -35,9 +34,13 @@ class Cat(Base):
         self.location[1] = value
 
     def animate(self):
-        self._anim_state = (self._anim_state + 1) % self._state_count
+        from envs.ui.sprites import sprite_map
+
+        self._anim_state = (self._anim_state + 1) % len(sprite_map["cat"])
         return super().animate()
 
     def draw(self, canvas):
+        from envs.ui.sprites import sprite_map
+
         self._set_image(sprite_map["cat"][self._anim_state])
         return super().draw(canvas)
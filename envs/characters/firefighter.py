@@ -1,8 +1,7 @@
 # envs/characters/firefighter.py
 
 import numpy as np
-from envs.constants import Action, config
-from envs.ui.sprites import sprite_map
+from envs.constants import Config, config
 from envs.tiles.base import Base
 
 
@@ -10,11 +9,10 @@ class FireFighter(Base):
     _anim_state = 0
     is_alive = True
 
-    def __init__(self, location: np.ndarray):
+    def __init__(self, location: np.ndarray, config: Config = config):
         self.location = location
+        self.config = config
         super().__init__(location[0], location[1])
-        self._death_state_count = len(sprite_map["firefighter"]["dying"])
-        self._idle_state_count = len(sprite_map["firefighter"]["idle"])
         self._anim_state = 0  # Current frame of animation
         self.is_dead = False
 
@@ -58,19 +56,25 @@ class FireFighter(Base):
         self.is_alive = False
 
     def draw(self, canvas):
+        from envs.ui.sprites import sprite_map
+
         if self.is_alive:
             self._set_image(sprite_map["firefighter"]["idle"][self._anim_state])
         else:
-            if self._anim_state < self._death_state_count - 1:
+            if self._anim_state < len(sprite_map["firefighter"]["dying"]) - 1:
                 self._set_image(sprite_map["firefighter"]["dying"][self._anim_state])
 
         return super().draw(canvas)
 
     def animate(self):
+        from envs.ui.sprites import sprite_map
+
         if self.is_alive:
-            self._anim_state = (self._anim_state + 1) % self._idle_state_count
+            self._anim_state = (self._anim_state + 1) % len(
+                sprite_map["firefighter"]["idle"]
+            )
         else:
-            if self._anim_state < self._death_state_count - 1:
+            if self._anim_state < len(sprite_map["firefighter"]["dying"]) - 1:
                 self._anim_state += 1
             else:
                 self._anim_state = 0
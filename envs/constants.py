@@ -1,45 +1,69 @@
 from q_learning.constants import RENDER
+from dataclasses import dataclass, replace
+from functools import cached_property
 from enum import Enum
 import numpy as np
 
 
+class FireModel(Enum):
+    RANDOM = 0  # single random sparks and extinguishes
+    SPREAD = 1  # fire also spreads to burning tiles' neighbours
+
+
+@dataclass(frozen=True)
 class Config:
-    def __init__(self):
-        self.grid_size = 6
-        self.window_size = 512
-        self.fps = 100
-        self.animation_delay = 1
-        self.square_size = int(self.window_size / self.grid_size)
-        self.durability_power = 1
-        self.is_rendering = RENDER
-
-        self.fire_size_on_object = 0.6
-        self.chance_of_catching_fire = 0.04
-        self.chance_of_self_extinguish = 0.004
-        self.chance_of_wall_being_window = 0.1
-        self.chance_of_wall_being_picture = 0.1
-        self.random_target_location = True
-        self.fire_state_count = 4
-
-        self.min_reward = -100
-        self.max_reward = 100
-        self.time_step_punishment = -2
-        self.death_punishment = -100
-        self.illeagal_move_punishment = -5
-        self.success_reward = 10
-        self.distance_reward = 0.2  # lower this and increase time_step_punishment for more accurate results
-        self.fire_extinguished_reward = 0
-        self.max_distance = np.linalg.norm(
+    """
+    Immutable settings of one environment. Derive variants with `replace`
+    instead of mutating, e.g. `config.replace(grid_size=8)`.
+    """
+
+    grid_size: int = 6
+    window_size: int = 512
+    fps: int = 100
+    animation_delay: float = 1
+    durability_power: int = 1
+    is_rendering: bool = RENDER
+
+    fire_size_on_object: float = 0.6
+    chance_of_catching_fire: float = 0.04
+    chance_of_self_extinguish: float = 0.004
+    chance_of_spreading: float = 0.05  # per burning neighbour, FireModel.SPREAD only
+    chance_of_wall_being_window: float = 0.1
+    chance_of_wall_being_picture: float = 0.1
+    random_target_location: bool = True
+    fire_state_count: int = 4
+
+    min_reward: float = -100
+    max_reward: float = 100
+    time_step_punishment: float = -2
+    death_punishment: float = -100
+    illeagal_move_punishment: float = -5
+    success_reward: float = 10
+    distance_reward: float = 0.2  # lower this and increase time_step_punishment for more accurate results
+    fire_extinguished_reward: float = 0
+
+    evacuation_success_reward: float = 1000  # Reward for reaching the cat/target
+    discount_factor: float = 0.9  # Discount factor for MDP Value Iteration
+
+    # Static Fire switch
+    static_fire_mode: bool = True
+    fire_model: FireModel = FireModel.RANDOM
+
+    @property
+    def square_size(self) -> int:
+        return int(self.window_size / self.grid_size)
+
+    @cached_property
+    def max_distance(self) -> float:
+        return np.linalg.norm(
             np.array([0, 0]) - np.array([self.grid_size, self.grid_size])
         )
 
-        self.evacuation_success_reward = 1000  # Reward for reaching the cat/target
-        self.discount_factor = 0.9  # Discount factor for MDP Value Iteration
-
-        # Static Fire switch
-        self.static_fire_mode = True
+    def replace(self, **changes) -> "Config":
+        return replace(self, **changes)
 
 
+# default for everything not given an explicit config
 config = Config()
 
 
@@ -69,6 +93,12 @@ class FloorType(Enum):
     PURPLE = 3
 
 
+class TileType(Enum):
+    FLOOR = 0
+    WALL = 1
+    ITEM = 2
+
+
 class Items(Enum):
     WINDOW = 0
     RADIO = 1
@@ -99,6 +129,35 @@ class Items(Enum):
     BED_PURPLE = 28
 
 
+ITEM_DURABILITY = {
+    Items.RADIO: 9,
+    Items.BOOKSHELF_EMPTY: 1,
+    Items.BOOKSHELF_FULL: 1,
+    Items.TABLE: 1,
+    Items.TABLE_SMALL: 8,
+    Items.CHAIR: 6,
+    Items.CHAIR_BLUE: 6,
+    Items.CHAIR_PURPLE: 6,
+    Items.CHAIR_RED: 6,
+    Items.OVEN: 1,
+    Items.TOILET: 1,
+    Items.POT: 5,
+    Items.POT_GREEN: 5,
+    Items.POT_PINK: 5,
+    Items.POT_RED: 5,
+    Items.CHEST: 1,
+    Items.STOOL: 4,
+    Items.BED_BLUE: 1,
+    Items.BED_RED: 1,
+    Items.BED_PURPLE: 1,
+    Items.NIGHTSTAND: 8,
+    Items.DOOR_OPEN: 2,
+    Items.TRAPDOOR_OPEN: 1,
+    Items.BIN: 7,
+    Items.MODERN_BIN: 9,
+}
+
+
 class Action(Enum):
     RIGHT = 0
     UP = 1
@@ -0,0 +1,115 @@
+import numpy as np
+from envs.constants import FireModel, Config, config
+
+
+def burning_neighbours(fire: np.ndarray) -> np.ndarray:
+    """
+    Counts the burning up, down, left and right neighbours of every tile,
+    the convolution of the fire mask with a cross shaped kernel. Works on a
+    single (height, width) mask or a stack of them.
+    """
+    fire = fire.astype(np.int8)
+    counts = np.zeros_like(fire)
+    counts[..., 1:, :] += fire[..., :-1, :]
+    counts[..., :-1, :] += fire[..., 1:, :]
+    counts[..., :, 1:] += fire[..., :, :-1]
+    counts[..., :, :-1] += fire[..., :, 1:]
+
+    return counts
+
+
+def pick_tiles(candidates: np.ndarray, draws: np.ndarray):
+    """
+    Picks one candidate tile per mask with one uniform draw each, the
+    `draws[i]`-th quantile of the candidates of mask `i` in row-major order.
+    Returns the mask indices and flat tile indices; masks without a
+    candidate are left out.
+    """
+    candidates = candidates.reshape(len(candidates), np.prod(candidates.shape[1:]))
+    counts = np.count_nonzero(candidates, axis=1)
+    rows = np.flatnonzero(counts)
+
+    nth = (draws[rows] * counts[rows]).astype(int)
+    cells = np.argmax(np.cumsum(candidates[rows], axis=1) > nth[:, None], axis=1)
+
+    return rows, cells
+
+
+class FireEngine:
+    """
+    Fire dynamics on boolean masks, for one grid of shape (height, width)
+    or a batch of grids of shape (num_envs, height, width).
+
+    `FireModel.RANDOM` is the original model: with `chance_of_catching_fire`
+    one random inflammable tile catches fire and with
+    `chance_of_self_extinguish` one random burning tile goes out.
+    `FireModel.SPREAD` keeps the random sparks, but fire also jumps to every
+    inflammable tile with `chance_of_spreading` per burning neighbour and
+    every burning tile goes out on its own with `chance_of_self_extinguish`.
+    In both models tiles occupied by the agent or the target never change
+    and burning items lose one durability per step.
+
+    All randomness of a step comes from one or two vectorized draws.
+    """
+
+    def __init__(
+        self,
+        inflammable: np.ndarray,
+        items: np.ndarray = None,
+        np_random=None,
+        config: Config = config,
+    ):
+        self.config = config
+        self.inflammable = inflammable
+        self.items = items
+        self.np = np_random if np_random is not None else np.random
+
+        # chance of catching from at least one of n = 0..4 burning neighbours
+        self._spread_chance = 1 - (1 - config.chance_of_spreading) ** np.arange(5)
+
+    def step(self, fire, occupied, durability=None) -> np.ndarray:
+        """
+        Advances `fire` (and `durability`) by one step in place and returns
+        the mask of the tiles which caught fire.
+        """
+        before = fire.copy()
+
+        if durability is not None and self.items is not None:
+            burning_items = fire & self.items & (durability > 0)
+            np.subtract(durability, 1, out=durability, where=burning_items)
+
+        fire3d = fire.reshape(-1, *fire.shape[-2:])
+        occupied3d = occupied.reshape(fire3d.shape)
+        free = ~occupied3d
+
+        # sparks and random extinguishing, one tile per grid at most
+        draws = self.np.random((len(fire3d), 4))
+        catching = draws[:, 0] < self.config.chance_of_catching_fire
+        rows, cells = pick_tiles(
+            (self.inflammable & free)[catching], draws[catching, 1]
+        )
+        fire3d.reshape(len(fire3d), -1)[np.flatnonzero(catching)[rows], cells] = True
+
+        if self.config.fire_model == FireModel.SPREAD:
+            self._spread(fire3d, free)
+        else:
+            extinguishing = draws[:, 2] < self.config.chance_of_self_extinguish
+            rows, cells = pick_tiles(
+                (fire3d & free)[extinguishing], draws[extinguishing, 3]
+            )
+            fire3d.reshape(len(fire3d), -1)[
+                np.flatnonzero(extinguishing)[rows], cells
+            ] = False
+
+        return fire & ~before
+
+    def _spread(self, fire, free):
+        draws = self.np.random(fire.shape)
+        neighbours = burning_neighbours(fire)
+
+        chance = self._spread_chance[neighbours]
+        catching = self.inflammable & free & ~fire & (draws < chance)
+        extinguishing = fire & free & (draws < self.config.chance_of_self_extinguish)
+
+        fire |= catching
+        fire &= ~extinguishing
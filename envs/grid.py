@@ -1,17 +1,17 @@
+from typing import TYPE_CHECKING
 import numpy as np
-from envs.constants import FloorType, config
-from envs.tiles.tile import Tile
-from envs.tiles.wall import Wall
-from envs.tiles.item import Item, Items
-from envs.tiles.floor import Floor
-from envs.utilities import decide_action, random_tile, is_occupied
+from envs.constants import FloorType, Items, TileType, ITEM_DURABILITY, Config, config
+from envs.utilities import random_tile
 from envs.characters.cat import Cat
 from envs.characters.firefighter import FireFighter
 from envs.constants import Action
-from envs.ui.sprites import sprite_map
 from envs.ui.room import RoomFactory
+from envs.fire import FireEngine
 from envs.utilities import out_of_grid
 
+if TYPE_CHECKING:
+    from envs.tiles.tile import Tile
+
 ACTION_TO_DIRECTION = {
     Action.RIGHT: np.array([1, 0]),
     Action.UP: np.array([0, -1]),
@@ -22,6 +22,16 @@ ACTION_TO_DIRECTION = {
 
 
 class Grid:
+    """
+    The room as a stack of per-tile NumPy layers.
+
+    The layout (tile, floor and item types plus the traversable and
+    inflammable masks) is written by the room factory, the simulation only
+    touches the `on_fire`, `durability` and `fire_state` layers. `Tile`
+    views over the layers are created on the first draw, so a grid that is
+    never drawn never imports pygame or touches a sprite.
+    """
+
     target: Cat = None
     agent: FireFighter = None
 
@@ -31,12 +41,17 @@ class Grid:
         static_mode=False,
         initial_agent_pos=None,
         initial_target_pos=None,
-        np_random=None,
+        np_random: np.random.Generator = None,
+        config: Config = config,
+        fire_np_random: np.random.Generator = None,
     ):
-        self.np = np_random if np_random is not None else np.random
+        self.config = config
+        # the layout and the fire draw from separate streams of the env
+        self.np = np_random if np_random is not None else np.random.default_rng()
+        self.fire_np = fire_np_random if fire_np_random is not None else self.np
         self.room_factory = room_factory
         self.is_animation_on_going = False
-        self.extinguishing_tile = None
+        self.extinguishing_pos = None
         self.extinguishing_state = 0
         self.static_mode = static_mode
         self.initial_agent_pos = initial_agent_pos
@@ -44,43 +59,170 @@ class Grid:
         self.create_grid()
 
     def create_grid(self):
-        self.tiles: list[list[Tile]] = [
-            [None for _ in range(config.grid_size)] for _ in range(config.grid_size)
-        ]
+        shape = (self.config.grid_size, self.config.grid_size)
+
+        self.tile_types = np.full(shape, TileType.FLOOR.value, dtype=np.int8)
+        self.floor_types = np.full(shape, FloorType.TILE.value, dtype=np.int8)
+        self.item_types = np.full(shape, -1, dtype=np.int8)
+        self.traversable = np.zeros(shape, dtype=bool)
+        self.inflammable = np.zeros(shape, dtype=bool)
+
+        self.on_fire = np.zeros(shape, dtype=bool)
+        self.durability = np.zeros(shape, dtype=np.int8)
+        self.fire_state = np.ones(shape, dtype=np.int8)
+
+        self._tiles = None
 
         self.room_factory.create_walls(self)
         self.room_factory.lay_floors(self)
         self.room_factory.create_items(self)
 
-        free_tiles: list[Tile] = list(
-            filter(
-                lambda tile: tile.is_traversable and not tile.is_on_fire,
-                [tile for row in self.tiles for tile in row],
-            )
+        # the layout is fixed from here on and shared by every episode and
+        # render view of the grid, reset only restores the state below
+        for layer in (
+            self.tile_types,
+            self.floor_types,
+            self.item_types,
+            self.traversable,
+            self.inflammable,
+        ):
+            layer.flags.writeable = False
+        self._initial_on_fire = self.on_fire.copy()
+        self._initial_durability = self.durability.copy()
+        self._free_positions = np.argwhere(self.traversable & ~self.on_fire)
+
+        self._place_characters()
+
+        self.fire_engine = FireEngine(
+            self.inflammable,
+            self.tile_types == TileType.ITEM.value,
+            self.fire_np,
+            self.config,
         )
 
-        target_location = None
+        # wall decorations are rolled when the grid is first drawn, possibly
+        # on a render thread, so they get a generator of their own
+        self.decoration_seed = self.np.integers(2**32)
+
+    def reset(self, initial_agent_pos=None, initial_target_pos=None):
+        """
+        Starts a new episode on the same layout. Only the fire, durability
+        and characters are restored, the layers written by the room factory,
+        the tile views and their wall decorations are kept.
+        """
+        np.copyto(self.on_fire, self._initial_on_fire)
+        np.copyto(self.durability, self._initial_durability)
+        self.fire_state.fill(1)
+
+        self.is_animation_on_going = False
+        self.extinguishing_pos = None
+        self.extinguishing_state = 0
+
+        self.initial_agent_pos = initial_agent_pos
+        self.initial_target_pos = initial_target_pos
+        self._place_characters()
+
+    def _place_characters(self):
+        free_positions = self._free_positions
+
         if self.initial_target_pos is None:
-            target_location = (
-                self.np.choice(free_tiles)
-                if config.random_target_location
-                else free_tiles[0]
+            target_index = (
+                self.np.choice(len(free_positions))
+                if self.config.random_target_location
+                else 0
             )
+            target_location = free_positions[target_index]
         else:
-            target_location = self.tiles[self.initial_target_pos[0]][self.initial_target_pos[1]]
-        self.target = Cat(np.array([target_location.x, target_location.y]))
-
+            target_location = np.array(self.initial_target_pos)
+            target_index = None
+        self.target = Cat(target_location.copy(), self.config)
 
         if self.initial_agent_pos is None:
-            free_tiles.remove(target_location)
-            agent_location: Tile = self.np.choice(free_tiles)
+            if target_index is None:
+                matches = np.flatnonzero((free_positions == target_location).all(1))
+                if len(matches) == 0:
+                    raise Exception("Target position not found among free tiles")
+                target_index = matches[0]
+
+            # sample among the free tiles with the target's tile left out
+            agent_index = self.np.choice(len(free_positions) - 1)
+            agent_index += agent_index >= target_index
+            agent_location = free_positions[agent_index]
         else:
-            agent_location = self.tiles[self.initial_agent_pos[0]][self.initial_agent_pos[1]]
+            agent_location = np.array(self.initial_agent_pos)
+
+        self.agent = FireFighter(agent_location.copy(), self.config)
+
+    def place_wall(self, x, y):
+        self.tile_types[x, y] = TileType.WALL.value
+        self.traversable[x, y] = False
+        self.inflammable[x, y] = False
+
+    def lay_floor(self, x, y, floor_type: FloorType):
+        self.tile_types[x, y] = TileType.FLOOR.value
+        self.floor_types[x, y] = floor_type.value
+        self.traversable[x, y] = True
+        self.inflammable[x, y] = True
+
+    def place_item(self, x, y, item_type: Items):
+        self.tile_types[x, y] = TileType.ITEM.value
+        self.item_types[x, y] = item_type.value
+        self.traversable[x, y] = False
+        self.inflammable[x, y] = False
+        self.durability[x, y] = (
+            ITEM_DURABILITY[item_type] * self.config.durability_power
+        )
 
-        self.agent = FireFighter(np.array([agent_location.x, agent_location.y]))
+    def set_on_fire(self, pos: tuple[int]):
+        if not self.inflammable[pos[0], pos[1]]:
+            raise Exception("Tile is not inflammable")
+
+        self.on_fire[pos[0], pos[1]] = True
+        self.fire_state[pos[0], pos[1]] = 0
+
+    def put_out_fire(self, pos: tuple[int]):
+        self.on_fire[pos[0], pos[1]] = False
+
+    @property
+    def tiles(self) -> "list[list[Tile]]":
+        if self._tiles is None:
+            self._tiles = self._create_tiles()
+
+        return self._tiles
+
+    def _create_tiles(self):
+        from envs.ui.sprites import load_srpite_map
+        from envs.tiles.wall import Wall
+        from envs.tiles.item import Item
+        from envs.tiles.floor import Floor
+
+        # the tiles pick their sprites now, at this grid's square size
+        load_srpite_map(self.config)
+
+        size = self.config.grid_size
+        decorations = np.random.default_rng(self.decoration_seed)
+        tiles: list[list[Tile]] = [[None for _ in range(size)] for _ in range(size)]
+
+        for x in range(size):
+            for y in range(size):
+                match TileType(self.tile_types[x, y]):
+                    case TileType.WALL:
+                        tiles[x][y] = Wall(self, x, y)
+                        tiles[x][y].register_neighbors(self, decorations)
+                    case TileType.FLOOR:
+                        tiles[x][y] = Floor(
+                            self, x, y, FloorType(self.floor_types[x, y])
+                        )
+                    case TileType.ITEM:
+                        tiles[x][y] = Item(
+                            Floor(self, x, y, FloorType(self.floor_types[x, y])),
+                            Items(self.item_types[x, y]),
+                        )
+
+        return tiles
 
     def is_agent_dead(self):
-        return self.tiles[self.agent.x][self.agent.y].is_on_fire
+        return bool(self.on_fire[self.agent.x, self.agent.y])
 
     def is_cat_rescued(self):
         return np.array_equal(self.agent.location, self.target.location)
@@ -94,8 +236,8 @@ class Grid:
         next_agent_location = self.agent.location + ACTION_TO_DIRECTION[action]
 
         if (
-            out_of_grid(next_agent_location)
-            or not self._tile_at(next_agent_location).is_traversable
+            out_of_grid(next_agent_location, self.config.grid_size)
+            or not self.traversable[next_agent_location[0], next_agent_location[1]]
         ):
             self._update_tiles()
             return False
@@ -110,11 +252,11 @@ class Grid:
                 )
 
                 if (
-                    not out_of_grid(border_tile_location)
-                    and self._tile_at(border_tile_location).is_on_fire
+                    not out_of_grid(border_tile_location, self.config.grid_size)
+                    and self.on_fire[border_tile_location[0], border_tile_location[1]]
                 ):
-                    self.extinguishing_tile = self._tile_at(border_tile_location)
-                    self.extinguishing_tile.put_out_fire()
+                    self.extinguishing_pos = border_tile_location
+                    self.put_out_fire(border_tile_location)
                     is_legal_move = True
                     break
         elif self.is_agent_dead():
@@ -129,21 +271,16 @@ class Grid:
         return is_legal_move
 
     def _update_tiles(self):
-        if config.static_fire_mode:
+        if self.config.static_fire_mode:
             return
 
-        for row in self.tiles:
-            for tile in row:
-                tile.update()
+        # the characters' tiles never change, burning items lose durability
+        occupied = np.zeros_like(self.on_fire)
+        occupied[self.agent.x, self.agent.y] = True
+        occupied[self.target.x, self.target.y] = True
 
-        if decide_action(config.chance_of_catching_fire):
-            tile = random_tile(self.tiles, self.target, self.agent, inflammable=True)
-            if tile:
-                tile.set_on_fire()
-        if decide_action(config.chance_of_self_extinguish):
-            tile = random_tile(self.tiles, self.target, self.agent, burning=True)
-            if tile:
-                tile.put_out_fire()
+        started = self.fire_engine.step(self.on_fire, occupied, self.durability)
+        self.fire_state[started] = 0
 
     def draw(self, canvas):
         for row in self.tiles:
@@ -152,21 +289,30 @@ class Grid:
 
         self.target.draw(canvas)
         self.agent.draw(canvas)
-
-        if self.extinguishing_tile is not None:
-            self.extinguishing_tile.is_on_fire = True
-            self.extinguishing_tile.draw(canvas)
-            self.extinguishing_tile.is_on_fire = False
+        self.draw_effects(canvas)
+
+    def draw_effects(self, canvas):
+        """
+        Draws the put out fire animation on top of the tiles and characters
+        and ends the animations which are done.
+        """
+        from envs.ui.sprites import sprite_map
+
+        if self.extinguishing_pos is not None:
+            extinguishing_tile = self._tile_at(self.extinguishing_pos)
+            extinguishing_tile.is_on_fire = True
+            extinguishing_tile.draw(canvas)
+            extinguishing_tile.is_on_fire = False
             if self.extinguishing_state < 2:
                 canvas.blit(
                     sprite_map["firefighter"]["put_out_fire"][self.extinguishing_state],
                     (
-                        self.extinguishing_tile.x * config.square_size,
-                        self.extinguishing_tile.y * config.square_size,
+                        extinguishing_tile.x * self.config.square_size,
+                        extinguishing_tile.y * self.config.square_size,
                     ),
                 )
             else:
-                self.extinguishing_tile = None
+                self.extinguishing_pos = None
                 self.extinguishing_state = 0
                 self.is_animation_on_going = False
 
@@ -174,34 +320,21 @@ class Grid:
             self.is_animation_on_going = False
 
     def animate(self):
-        for row in self.tiles:
-            for tile in row:
-                tile.animate()
+        self.fire_state[self.on_fire] = (
+            self.fire_state[self.on_fire] + 1
+        ) % self.config.fire_state_count
 
         self.target.animate()
         self.agent.animate()
 
-        if self.extinguishing_tile is not None:
+        if self.extinguishing_pos is not None:
             if self.extinguishing_state < 2:
                 self.extinguishing_state += 1
 
     def _random_empty_space(self):
-        possible_tiles = []
-
-        possible_tiles: list[Tile] = []
-        for row in self.tiles:
-            for tile in row:
-                if (
-                    isinstance(tile, Floor)
-                    and (self.target is None or not is_occupied(tile, self.target))
-                    and (self.agent is None or not is_occupied(tile, self.agent))
-                ):
-                    possible_tiles.append(tile)
-
-        if not possible_tiles:
-            return None
-
-        return np.random.choice(possible_tiles)
+        return random_tile(
+            self.tile_types == TileType.FLOOR.value, self.target, self.agent, self.np
+        )
 
     def _tile_at(self, pos: tuple[int]):
         return self.tiles[pos[0]][pos[1]]
@@ -2,40 +2,96 @@ import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
 from envs.grid import Grid
-from envs.constants import Action, config
-from envs.ui.window import Window
+from envs.constants import Action, Config, config
+from envs.ui.room import RoomFactory
 from envs.ui.training_room import TrainingRoom
+from envs.utilities import ObservationEncoder, random_streams
 
+# tile whose fire state is exposed in the observation
+FIRE_SENSOR_POSITION = (3, 2)
 
-class FireFighterWorld(gym.Env):
-    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": config.fps}
 
-    def __init__(self, static_mode=False, render_mode=None):
+class FireFighterWorld(gym.Env):
+    metadata = {
+        "render_modes": ["human", "human_async", "rgb_array"],
+        "render_fps": config.fps,
+    }
+
+    def __init__(
+        self,
+        static_mode=False,
+        render_mode=None,
+        observation_mode="tuple",
+        room_factory: RoomFactory = None,
+        config: Config = config,
+    ):
+        # sprites are only loaded for configs that render
+        if render_mode is not None and not config.is_rendering:
+            config = config.replace(is_rendering=True)
+
+        self.config = config
         self.grid = None  # Will be initialized in reset
+        self.random_streams = None  # spawned from np_random in reset
         self.static_mode = static_mode
+        # a procedural factory gives every episode a new floor plan
+        self.room_factory = room_factory if room_factory is not None else TrainingRoom()
+
+        # "discrete" emits the flat state index instead of the tuple
+        assert observation_mode in ["tuple", "discrete"]
+        self.observation_mode = observation_mode
+        self.encoder = ObservationEncoder(config.grid_size)
 
-        self.observation_space = spaces.Tuple(
-            (
-                spaces.Box(0, config.grid_size - 1, shape=(2,), dtype=int),  # agent
-                spaces.Box(0, config.grid_size - 1, shape=(2,), dtype=int),  # target
-                spaces.Discrete(2),  # is_fire_present
+        if observation_mode == "discrete":
+            self.observation_space = spaces.Discrete(self.encoder.num_states)
+        else:
+            self.observation_space = spaces.Tuple(
+                (
+                    spaces.Box(0, config.grid_size - 1, shape=(2,), dtype=int),  # agent
+                    spaces.Box(0, config.grid_size - 1, shape=(2,), dtype=int),  # target
+                    spaces.Discrete(2),  # is_fire_present
+                )
             )
-        )
 
         self.action_space = spaces.Discrete(len(Action))
 
         assert render_mode is None or render_mode in self.metadata["render_modes"]
         self.render_mode = render_mode
 
-        self.window = Window() if self.render_mode == "human" else None
+        self.window = None
+        self.renderer = None
+        if self.render_mode == "human":
+            from envs.ui.window import Window
+            from envs.ui.renderer import GridRenderer
+
+            self.window = Window(config)
+            self.renderer = GridRenderer()
+
+        # human_async draws on its own thread, steps never wait for a frame,
+        # it is not available on macOS, where windows need the main thread
+        self.render_thread = None
+        if self.render_mode == "human_async":
+            from envs.ui.render_thread import RenderThread
+
+            self.render_thread = RenderThread(config)
+            self.render_thread.start()
+
+        # rgb_array draws offscreen, the canvas is created on the first render
+        self._canvas = None
+        self._frame = None
+        self._animation_stage = 0
 
     def _get_obs(self):
-        return (
+        observation = (
             self.grid.agent.location,
             self.grid.target.location,
-            self.grid.tiles[3][2].is_on_fire,
+            bool(self.grid.on_fire[FIRE_SENSOR_POSITION[0], FIRE_SENSOR_POSITION[1]]),
         )
 
+        if self.observation_mode == "discrete":
+            return self.encoder.encode(observation)
+
+        return observation
+
     def _get_info(self, is_legal_move=True):
         return {
             "is_legal_move": is_legal_move,
@@ -47,6 +103,8 @@ class FireFighterWorld(gym.Env):
 
     def reset(self, seed=None, options=None):
         super().reset(seed=seed)
+        if seed is not None or self.random_streams is None:
+            self.random_streams = random_streams(self.np_random)
 
         # options can now include 'initial_agent_pos' and 'initial_target_pos' for MDP
         initial_agent_pos = None
@@ -56,57 +114,71 @@ class FireFighterWorld(gym.Env):
         if options and "initial_target_pos" in options:
             initial_target_pos = options["initial_target_pos"]
 
-        # Re-create grid with specified initial positions if in static mode for MDP
-        self.grid = Grid(
-            TrainingRoom(),
-            self.static_mode,
-            initial_agent_pos,
-            initial_target_pos,
-            self.np_random,
-        )
+        # a fixed layout is built once, later episodes only restore its state,
+        # a new seed builds it again so seeded runs match a fresh env
+        if seed is None and self.grid is not None and self.room_factory.fixed_layout:
+            self.grid.reset(initial_agent_pos, initial_target_pos)
+        else:
+            self.grid = Grid(
+                self.room_factory,
+                self.static_mode,
+                initial_agent_pos,
+                initial_target_pos,
+                self.random_streams["layout"],
+                self.config,
+                self.random_streams["fire"],
+            )
 
         if "preset_fire_positions" in options:
             for pos in options["preset_fire_positions"]:
-                self.grid.tiles[pos[0]][pos[1]].is_on_fire = True
+                self.grid.on_fire[pos[0], pos[1]] = True
 
         if self.render_mode == "human":
             self._render_frame()
+        elif self.render_mode == "human_async":
+            self.render_thread.publish(self.grid)
 
         return self._get_obs(), self._get_info()
 
     def step(self, action):
         is_legal_move = self.grid.update(list(Action)[action])
 
-        reward = config.time_step_punishment + config.distance_reward * (
-            config.max_distance
+        reward = self.config.time_step_punishment + self.config.distance_reward * (
+            self.config.max_distance
             - np.linalg.norm(self.grid.agent.location - self.grid.target.location)
         )
 
         terminated = False
 
         if not is_legal_move:
-            reward += config.illeagal_move_punishment
+            reward += self.config.illeagal_move_punishment
         elif self.grid.is_agent_dead():
             terminated = True
-            reward += config.death_punishment
+            reward += self.config.death_punishment
         elif self.grid.is_cat_rescued():
             terminated = True
-            reward += config.evacuation_success_reward
+            reward += self.config.evacuation_success_reward
         elif action == Action.PUT_OUT_FIRE.value:
-            reward += config.fire_extinguished_reward
+            reward += self.config.fire_extinguished_reward
 
         if self.render_mode == "human":
             self._render_frame()
+        elif self.render_mode == "human_async":
+            self.render_thread.publish(self.grid)
 
         return (
             self._get_obs(),
-            max(min(reward, config.max_reward), config.min_reward),  # clip reward
+            # clip reward
+            max(min(reward, self.config.max_reward), self.config.min_reward),
             terminated,
             False,
             self._get_info(is_legal_move),
         )
 
     def render(self):
+        if self.render_mode == "rgb_array":
+            return self._render_rgb_array()
+
         if self.render_mode != "human":
             return
 
@@ -119,10 +191,47 @@ class FireFighterWorld(gym.Env):
 
     def _render_frame(self):
         self.window.draw(
-            lambda canvas: self.grid.draw(canvas),
+            lambda canvas: self.renderer.draw(self.grid, canvas),
             lambda: self.grid.animate(),
         )
 
+    def _render_rgb_array(self):
+        """
+        Returns the frame as a (height, width, 3) uint8 array. The array is
+        reused by every call, copy it to keep a frame past the next render.
+        """
+        from envs.ui.sprites import load_srpite_map
+
+        # another environment may have rendered at another square size since
+        load_srpite_map(self.config)
+        if self._canvas is None:
+            import pygame
+            from envs.ui.renderer import GridRenderer
+
+            size = (self.config.window_size, self.config.window_size)
+            self._canvas = pygame.Surface(size)
+            self._frame = np.empty((*size, 3), dtype=np.uint8)
+            self.renderer = GridRenderer()
+
+        # same animation pace as the window, just without waiting on a clock
+        if self._animation_stage >= self.config.fps * self.config.animation_delay:
+            self.grid.animate()
+            self._animation_stage = 0
+        else:
+            self._animation_stage += self.config.fps
+
+        self.renderer.draw(self.grid, self._canvas)
+
+        from pygame.surfarray import pixels3d
+
+        pixels = pixels3d(self._canvas)
+        np.copyto(self._frame, pixels.transpose(1, 0, 2))
+        del pixels  # unlocks the canvas
+
+        return self._frame
+
     def close(self):
         if self.window is not None:
             self.window.close()
+        if self.render_thread is not None:
+            self.render_thread.close()
@@ -0,0 +1,238 @@
+import numpy as np
+from gymnasium.utils import seeding
+from envs.constants import Action, Config, config
+from envs.grid import Grid, ACTION_TO_DIRECTION
+from envs.fire import FireEngine
+from envs.grid_world import FIRE_SENSOR_POSITION
+from envs.ui.room import RoomFactory
+from envs.ui.training_room import TrainingRoom
+from envs.utilities import ObservationEncoder, random_streams
+
+ACTION_DIRECTIONS = np.array([ACTION_TO_DIRECTION[action] for action in Action])
+
+# same order as Grid.update checks the neighbours when putting out fire
+FIRE_CHECK_DIRECTIONS = np.array(
+    [
+        ACTION_TO_DIRECTION[movement]
+        for movement in [Action.UP, Action.DOWN, Action.LEFT, Action.RIGHT]
+    ]
+)
+
+
+class FireFighterWorldBatch:
+    """
+    Runs `num_envs` copies of FireFighterWorld at once.
+
+    The state of every environment lives in stacked NumPy arrays (agent and
+    target positions, fire mask) next to a traversable mask shared by all
+    of them, so `reset` and `step` cost a handful of array operations
+    instead of one Python object graph walk per environment.
+    Rewards, legality and termination follow `FireFighterWorld.step`.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        room_factory: RoomFactory = None,
+        observation_mode="tuple",
+        config: Config = config,
+    ):
+        self.config = config
+        self.num_envs = num_envs
+
+        # "discrete" emits the flat state indices instead of the tuple
+        assert observation_mode in ["tuple", "discrete"]
+        self.observation_mode = observation_mode
+        self.encoder = ObservationEncoder(config.grid_size)
+        self.room_factory = room_factory if room_factory is not None else TrainingRoom()
+
+        self.agent = np.zeros((num_envs, 2), dtype=int)
+        self.target = np.zeros((num_envs, 2), dtype=int)
+        self.fire = np.zeros(
+            (num_envs, config.grid_size, config.grid_size), dtype=bool
+        )
+
+        self._seed(None)
+
+    def _get_obs(self):
+        observations = (
+            self.agent.copy(),
+            self.target.copy(),
+            self.fire[:, FIRE_SENSOR_POSITION[0], FIRE_SENSOR_POSITION[1]].copy(),
+        )
+
+        if self.observation_mode == "discrete":
+            return self.encoder.encode_batch(observations)
+
+        return observations
+
+    def _get_info(self, is_legal_move=None):
+        return {
+            "is_legal_move": (
+                np.ones(self.num_envs, dtype=bool)
+                if is_legal_move is None
+                else is_legal_move
+            ),
+            "is_agent_dead": self.is_agent_dead(),
+            "distance": np.linalg.norm(self.agent - self.target, axis=1),
+        }
+
+    def is_agent_dead(self):
+        return self.fire[np.arange(self.num_envs), self.agent[:, 0], self.agent[:, 1]]
+
+    def is_cat_rescued(self):
+        return np.all(self.agent == self.target, axis=1)
+
+    def reset(self, seed=None, options=None):
+        """
+        Resets the environments selected by `options["mask"]` (all by default).
+
+        Accepts the same options as `FireFighterWorld.reset`:
+        `initial_agent_pos`, `initial_target_pos` and `preset_fire_positions`.
+        """
+        if seed is not None:
+            self._seed(seed)
+
+        options = options or {}
+        rows = np.flatnonzero(options.get("mask", np.ones(self.num_envs, dtype=bool)))
+        free_count = len(self.free_positions)
+        layout = self.random_streams["layout"]
+
+        if "initial_target_pos" in options:
+            self.target[rows] = options["initial_target_pos"]
+            matches = np.all(
+                self.free_positions[None] == self.target[rows][:, None], axis=2
+            )
+            if not matches.any(axis=1).all():
+                raise Exception("Target position not found among free tiles")
+            target_idx = matches.argmax(axis=1)
+        else:
+            target_idx = (
+                layout.integers(free_count, size=len(rows))
+                if self.config.random_target_location
+                else np.zeros(len(rows), dtype=int)
+            )
+            self.target[rows] = self.free_positions[target_idx]
+
+        if "initial_agent_pos" in options:
+            self.agent[rows] = options["initial_agent_pos"]
+        else:
+            # sample among the free tiles with the target's tile left out
+            agent_idx = layout.integers(free_count - 1, size=len(rows))
+            agent_idx += agent_idx >= target_idx
+            self.agent[rows] = self.free_positions[agent_idx]
+
+        self.fire[rows] = False
+        for pos in options.get("preset_fire_positions", []):
+            self.fire[rows, pos[0], pos[1]] = True
+
+        return self._get_obs(), self._get_info()
+
+    def _seed(self, seed):
+        """
+        Seeds the streams and builds the shared layout from the layout
+        stream, so a seeded reset gives the same room in every process.
+        """
+        self.np_random, _ = seeding.np_random(seed)
+        self.random_streams = random_streams(self.np_random)
+
+        layout = Grid(
+            self.room_factory,
+            np_random=self.random_streams["layout"],
+            config=self.config,
+            fire_np_random=self.random_streams["fire"],
+        )
+        self.traversable = layout.traversable
+        self.inflammable = layout.inflammable
+
+        # row-major over [x, y], the order Grid.create_grid samples from
+        self.free_positions = np.argwhere(self.traversable)
+
+        self.fire_engine = FireEngine(
+            self.inflammable, np_random=self.random_streams["fire"], config=self.config
+        )
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+
+        next_agent = self.agent + ACTION_DIRECTIONS[actions]
+        in_grid = np.all(
+            (next_agent >= 0) & (next_agent < self.config.grid_size), axis=1
+        )
+        next_agent = np.clip(next_agent, 0, self.config.grid_size - 1)
+        is_legal_move = in_grid & self.traversable[next_agent[:, 0], next_agent[:, 1]]
+        self.agent[is_legal_move] = next_agent[is_legal_move]
+
+        put_out_fire = is_legal_move & (actions == Action.PUT_OUT_FIRE.value)
+        if put_out_fire.any():
+            is_legal_move &= ~put_out_fire | self._put_out_fire(put_out_fire)
+
+        if not self.config.static_fire_mode:
+            self._update_fire()
+
+        is_agent_dead = self.is_agent_dead()
+        is_cat_rescued = self.is_cat_rescued()
+
+        reward = self.config.time_step_punishment + self.config.distance_reward * (
+            self.config.max_distance
+            - np.linalg.norm(self.agent - self.target, axis=1)
+        )
+        reward += np.select(
+            [
+                ~is_legal_move,
+                is_agent_dead,
+                is_cat_rescued,
+                actions == Action.PUT_OUT_FIRE.value,
+            ],
+            [
+                self.config.illeagal_move_punishment,
+                self.config.death_punishment,
+                self.config.evacuation_success_reward,
+                self.config.fire_extinguished_reward,
+            ],
+            0,
+        )
+        terminated = is_legal_move & (is_agent_dead | is_cat_rescued)
+
+        return (
+            self._get_obs(),
+            np.clip(reward, self.config.min_reward, self.config.max_reward),
+            terminated,
+            np.zeros(self.num_envs, dtype=bool),
+            {
+                "is_legal_move": is_legal_move,
+                "is_agent_dead": is_agent_dead,
+                "distance": np.linalg.norm(self.agent - self.target, axis=1),
+            },
+        )
+
+    def _put_out_fire(self, rows_mask):
+        """
+        Puts out the first burning neighbour of every selected agent and
+        returns which of them had one to put out.
+        """
+        rows = np.flatnonzero(rows_mask)
+        neighbours = self.agent[rows, None, :] + FIRE_CHECK_DIRECTIONS[None]
+        in_grid = np.all(
+            (neighbours >= 0) & (neighbours < self.config.grid_size), axis=2
+        )
+        neighbours = np.clip(neighbours, 0, self.config.grid_size - 1)
+        burning = in_grid & self.fire[
+            rows[:, None], neighbours[..., 0], neighbours[..., 1]
+        ]
+
+        has_fire = burning.any(axis=1)
+        first = neighbours[np.arange(len(rows)), burning.argmax(axis=1)]
+        self.fire[rows[has_fire], first[has_fire, 0], first[has_fire, 1]] = False
+
+        had_fire = np.zeros(self.num_envs, dtype=bool)
+        had_fire[rows] = has_fire
+        return had_fire
+
+    def _update_fire(self):
+        occupied = np.zeros_like(self.fire)
+        env_idx = np.arange(self.num_envs)
+        occupied[env_idx, self.agent[:, 0], self.agent[:, 1]] = True
+        occupied[env_idx, self.target[:, 0], self.target[:, 1]] = True
+
+        self.fire_engine.step(self.fire, occupied)
@@ -1,8 +1,9 @@
-from envs.constants import config
+from envs.constants import Config, config
 
 
 class Base:
     _image = None
+    config: Config = config
 
     def __init__(self, x: int, y: int):
         self.x = x
@@ -13,7 +14,8 @@ class Base:
 
     def draw(self, canvas):
         canvas.blit(
-            self._image, (self.x * config.square_size, self.y * config.square_size)
+            self._image,
+            (self.x * self.config.square_size, self.y * self.config.square_size),
         )
 
     def update(self):
@@ -1,6 +1,5 @@
-from envs.constants import FloorType, Side
+from envs.constants import FloorType, Side, TileType
 from envs.tiles.tile import Tile
-from envs.tiles.wall import Wall
 from envs.ui.sprites import sprite_map
 
 
@@ -40,26 +39,25 @@ def get_sprite_from_borders(sprite_map: dict, borders: list[Side]):
     return sprite_map[category_name]
 
 
-def get_borders(tiles: list[list[Tile]], x, y):
+def get_borders(grid, x, y):
     sides: list[Side] = []
+    is_wall = grid.tile_types == TileType.WALL.value
 
-    if y > 0 and isinstance(tiles[x][y - 1], Wall):
+    if y > 0 and is_wall[x, y - 1]:
         sides.append(Side.TOP)
-    if x < len(tiles[0]) - 1 and isinstance(tiles[x + 1][y], Wall):
+    if x < len(is_wall[0]) - 1 and is_wall[x + 1, y]:
         sides.append(Side.RIGHT)
-    if y < len(tiles) - 1 and isinstance(tiles[x][y + 1], Wall):
+    if y < len(is_wall) - 1 and is_wall[x, y + 1]:
         sides.append(Side.BOTTOM)
-    if x > 0 and isinstance(tiles[x - 1][y], Wall):
+    if x > 0 and is_wall[x - 1, y]:
         sides.append(Side.LEFT)
 
     return sides
 
 
 class Floor(Tile):
-    def __init__(self, x: int, y: int, tiles: list[list[Tile]], type: FloorType):
-        super().__init__(x, y)
-        self.is_traversable = True
-        self.is_inflammable = True
+    def __init__(self, grid, x: int, y: int, type: FloorType):
+        super().__init__(grid, x, y)
 
         image = None
         match type:
@@ -76,4 +74,4 @@ class Floor(Tile):
             case _:
                 raise Exception(f"Floor with type {type} not found")
 
-        self._set_image(get_sprite_from_borders(image, get_borders(tiles, x, y)))
+        self._set_image(get_sprite_from_borders(image, get_borders(grid, x, y)))
@@ -1,41 +1,58 @@
 from envs.ui.sprites import sprite_map
 from envs.tiles.base import Base
-from envs.constants import config
 
 
 class Tile(Base):
-    is_on_fire = False
+    """
+    Renderer-side view of one grid cell. The cell state itself lives in
+    the grid's arrays, so views are only created when the grid is drawn.
+    """
+
     is_breakable = False
-    is_traversable = False
-    is_inflammable = False
-    _fire_state = 1
 
-    def __init__(self, x, y):
+    def __init__(self, grid, x, y):
         super().__init__(x, y)
-        self._fire_state_count = len(sprite_map["fires"])
+        self._grid = grid
+        self.config = grid.config
 
-    def set_on_fire(self):
-        if not self.is_inflammable:
-            raise Exception("Tile is not inflammable")
+    @property
+    def is_on_fire(self):
+        return bool(self._grid.on_fire[self.x, self.y])
+
+    @is_on_fire.setter
+    def is_on_fire(self, value):
+        self._grid.on_fire[self.x, self.y] = value
+
+    @property
+    def is_traversable(self):
+        return bool(self._grid.traversable[self.x, self.y])
+
+    @property
+    def is_inflammable(self):
+        return bool(self._grid.inflammable[self.x, self.y])
+
+    @property
+    def _fire_state(self):
+        return self._grid.fire_state[self.x, self.y]
 
-        self.is_on_fire = True
-        self._fire_state = 0
+    def set_on_fire(self):
+        self._grid.set_on_fire((self.x, self.y))
 
     def put_out_fire(self):
-        self.is_on_fire = False
+        self._grid.put_out_fire((self.x, self.y))
 
     def draw(self, canvas):
-        super().draw(canvas)
+        self.draw_background(canvas)
 
         if self.is_on_fire:
             self.draw_fire(canvas)
 
+    def draw_background(self, canvas):
+        """Draws the tile without its fire."""
+        super().draw(canvas)
+
     def draw_fire(self, canvas):
         canvas.blit(
             sprite_map["fires"][self._fire_state - 1],
-            (self.x * config.square_size, self.y * config.square_size),
+            (self.x * self.config.square_size, self.y * self.config.square_size),
         )
-
-    def animate(self):
-        if self.is_on_fire:
-            self._fire_state = (self._fire_state + 1) % self._fire_state_count
@@ -1,38 +1,41 @@
 import pygame
 from envs.tiles.tile import Tile
 from envs.ui.sprites import sprite_map
-from envs.constants import config
+from envs.constants import TileType
 from envs.utilities import decide_action
 
 
-def is_tile_above_wall(tiles, x, y):
-    return y > 0 and isinstance(tiles[x][y - 1], Wall)
+def is_tile_above_wall(grid, x, y):
+    return y > 0 and grid.tile_types[x, y - 1] == TileType.WALL.value
 
 
-def is_tile_below_empty(tiles, x, y):
-    return y >= len(tiles) - 1 or isinstance(tiles[x][y + 1], Wall)
+def is_tile_below_empty(grid, x, y):
+    return (
+        y >= len(grid.tile_types) - 1
+        or grid.tile_types[x, y + 1] == TileType.WALL.value
+    )
 
 
 class Wall(Tile):
-    def __init__(self, x: int, y: int):
-        super().__init__(x, y)
+    def __init__(self, grid, x: int, y: int):
+        super().__init__(grid, x, y)
         self._set_image(sprite_map["wall"]["front"])
 
-    def register_neighbors(self, tiles: list[list[Tile]]):
+    def register_neighbors(self, grid, np_random):
 
-        if is_tile_below_empty(tiles, self.x, self.y):
+        if is_tile_below_empty(grid, self.x, self.y):
             self._set_image(sprite_map["wall"]["top"])
         else:
             self._set_image(sprite_map["wall"]["front"])
 
-            if is_tile_below_empty(tiles, self.x, self.y) and decide_action(
-                config.chance_of_wall_being_picture
+            if is_tile_below_empty(grid, self.x, self.y) and decide_action(
+                self.config.chance_of_wall_being_picture, np_random
             ):
                 self._set_image(sprite_map["picture"])
             elif (
-                not is_tile_above_wall(tiles, self.x, self.y)
-                and is_tile_below_empty(tiles, self.x, self.y)
-                and decide_action(config.chance_of_wall_being_window)
+                not is_tile_above_wall(grid, self.x, self.y)
+                and is_tile_below_empty(grid, self.x, self.y)
+                and decide_action(self.config.chance_of_wall_being_window, np_random)
             ):
                 self._set_image(sprite_map["window"])
 
@@ -40,7 +43,7 @@ class Wall(Tile):
         raise Exception("Wall is not inflammable")
 
     def _set_image(self, img):
-        if not config.is_rendering:
+        if not self.config.is_rendering:
             return
 
         if self.x % 2 == 0:
@@ -1,9 +1,10 @@
 from envs.ui.room import RoomFactory
-from envs.tiles.item import Item, Items
-from envs.tiles.wall import Wall
+from envs.constants import Items
 
 
 class PlayRoom(RoomFactory):
+    fixed_layout = False  # the radio moves
+
     def create_walls(self, grid):
         super().create_walls(grid)
 
@@ -29,23 +30,20 @@ class PlayRoom(RoomFactory):
         ]
 
         for pos in positions:
-            grid.tiles[pos[0]][pos[1]] = Wall(pos[0], pos[1])
-
-        for pos in positions:
-            grid.tiles[pos[0]][pos[1]].register_neighbors(grid.tiles)
+            grid.place_wall(pos[0], pos[1])
 
     def create_items(self, grid):
         super().create_items(grid)
 
-        grid.tiles[0][3] = Item(grid.tiles[0][3], Items.BOOKSHELF_FULL)
-        grid.tiles[1][0] = Item(grid.tiles[1][0], Items.BED_RED)
-        grid.tiles[2][0] = Item(grid.tiles[2][0], Items.POT_GREEN)
+        grid.place_item(0, 3, Items.BOOKSHELF_FULL)
+        grid.place_item(1, 0, Items.BED_RED)
+        grid.place_item(2, 0, Items.POT_GREEN)
 
-        grid.tiles[7][1] = Item(grid.tiles[7][1], Items.CHAIR_RED)
-        grid.tiles[7][2] = Item(grid.tiles[7][2], Items.TABLE)
+        grid.place_item(7, 1, Items.CHAIR_RED)
+        grid.place_item(7, 2, Items.TABLE)
 
         floor = grid._random_empty_space()
-        if not floor:
+        if floor is None:
             return
 
-        grid.tiles[floor.x][floor.y] = Item(floor, Items.RADIO)
+        grid.place_item(floor[0], floor[1], Items.RADIO)
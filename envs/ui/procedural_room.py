@@ -0,0 +1,204 @@
+import numpy as np
+from envs.ui.room import RoomFactory
+from envs.constants import FloorType, Items, TileType, ITEM_DURABILITY
+from envs.fire import burning_neighbours
+
+# plain tiles have no sprite of their own
+CARPETS = [FloorType.RED.value, FloorType.BLUE.value, FloorType.PURPLE.value]
+
+# every item with a durability and a sprite, except doors
+FURNITURE = [
+    Items.RADIO,
+    Items.BOOKSHELF_EMPTY,
+    Items.BOOKSHELF_FULL,
+    Items.TABLE,
+    Items.TABLE_SMALL,
+    Items.CHAIR_BLUE,
+    Items.CHAIR_PURPLE,
+    Items.CHAIR_RED,
+    Items.OVEN,
+    Items.TOILET,
+    Items.POT,
+    Items.POT_GREEN,
+    Items.POT_PINK,
+    Items.POT_RED,
+    Items.CHEST,
+    Items.STOOL,
+    Items.BED_BLUE,
+    Items.BED_RED,
+    Items.BED_PURPLE,
+    Items.BIN,
+]
+
+
+class ProceduralRoom(RoomFactory):
+    """
+    Seeded floor plan of any size, split into rooms by binary space
+    partitioning. Every split wall gets one door, and later splits never
+    end in front of a door, so all rooms stay connected. Furniture only
+    stands along the room walls, away from corners and doors, so it can
+    never cut a room in two.
+
+    Every grid built with the factory gets a new plan drawn from the grid's
+    layout stream, so an env seeds its plans like the rest of its layout. A
+    `seed` overrides that with a sequence of plans of the factory's own.
+    Walls, floors and items are written to the grid's layers with array
+    operations, a 512x512 plan takes well under a second.
+    """
+
+    fixed_layout = False
+
+    def __init__(
+        self,
+        seed=None,
+        min_room_size=3,
+        max_room_size=12,
+        item_density=0.3,
+    ):
+        assert min_room_size >= 3, "rooms need a free inner tile"
+
+        self._seeded_random = (
+            np.random.default_rng(seed) if seed is not None else None
+        )
+        self.np_random = None
+        self.min_room_size = min_room_size
+        self.max_room_size = max_room_size
+        self.item_density = item_density
+        self.rooms = []
+        self.doors = []
+
+    def create_walls(self, grid):
+        self.np_random = (
+            self._seeded_random if self._seeded_random is not None else grid.np
+        )
+        size = grid.config.grid_size
+        self.rooms, self.doors = self._partition(size)
+
+        walls = np.ones((size, size), dtype=bool)
+        for x0, y0, x1, y1 in self.rooms:
+            walls[x0:x1, y0:y1] = False
+        for x, y in self.doors:
+            walls[x, y] = False
+
+        grid.tile_types[walls] = TileType.WALL.value
+        grid.traversable[walls] = False
+        grid.inflammable[walls] = False
+
+    def lay_floors(self, grid):
+        floor_types = self.np_random.choice(CARPETS, size=len(self.rooms))
+
+        for (x0, y0, x1, y1), floor_type in zip(self.rooms, floor_types):
+            grid.floor_types[x0:x1, y0:y1] = floor_type
+        # a door takes the carpet of the room left of it, or above it
+        for x, y in self.doors:
+            if grid.tile_types[x - 1, y] != TileType.WALL.value:
+                grid.floor_types[x, y] = grid.floor_types[x - 1, y]
+            else:
+                grid.floor_types[x, y] = grid.floor_types[x, y - 1]
+
+        floors = grid.tile_types != TileType.WALL.value
+        grid.tile_types[floors] = TileType.FLOOR.value
+        grid.traversable[floors] = True
+        grid.inflammable[floors] = True
+
+    def create_items(self, grid):
+        size = grid.config.grid_size
+
+        # the rim of every room, corners and their neighbours are kept free
+        rims = np.zeros((size, size), dtype=bool)
+        for x0, y0, x1, y1 in self.rooms:
+            rims[x0, y0 + 2 : y1 - 2] = True
+            rims[x1 - 1, y0 + 2 : y1 - 2] = True
+            rims[x0 + 2 : x1 - 2, y0] = True
+            rims[x0 + 2 : x1 - 2, y1 - 1] = True
+
+        doors = np.zeros((size, size), dtype=bool)
+        for x, y in self.doors:
+            doors[x, y] = True
+        rims &= burning_neighbours(doors) == 0
+
+        items = rims & (self.np_random.random((size, size)) < self.item_density)
+        item_types = np.array([item.value for item in FURNITURE])[
+            self.np_random.integers(len(FURNITURE), size=np.count_nonzero(items))
+        ]
+        durability = np.zeros(max(Items, key=lambda item: item.value).value + 1)
+        for item, value in ITEM_DURABILITY.items():
+            durability[item.value] = value * grid.config.durability_power
+
+        grid.tile_types[items] = TileType.ITEM.value
+        grid.item_types[items] = item_types
+        grid.traversable[items] = False
+        grid.inflammable[items] = False
+        grid.durability[items] = durability[item_types]
+
+    def _partition(self, size):
+        """
+        Splits the grid into rooms, each given as (x0, y0, x1, y1) with
+        exclusive ends. Returns the rooms and the door positions.
+        """
+        rooms = []
+        doors = []
+        # a region with the doors on its borders, no split wall may end in
+        # front of one of them
+        regions = [((0, 0, size, size), [])]
+
+        while regions:
+            region, border_doors = regions.pop()
+            x0, y0, x1, y1 = region
+
+            splits = self._splits(region, border_doors)
+            if not splits or (
+                max(x1 - x0, y1 - y0) <= self.max_room_size
+                and self.np_random.random() < 0.5
+            ):
+                rooms.append(region)
+                continue
+
+            axis, split = splits[self.np_random.integers(len(splits))]
+            if axis == 0:
+                door = (split, int(self.np_random.integers(y0, y1)))
+                children = [(x0, y0, split, y1), (split + 1, y0, x1, y1)]
+            else:
+                door = (int(self.np_random.integers(x0, x1)), split)
+                children = [(x0, y0, x1, split), (x0, split + 1, x1, y1)]
+            doors.append(door)
+
+            for child in children:
+                regions.append(
+                    (
+                        child,
+                        [
+                            pos
+                            for pos in border_doors + [door]
+                            if self._borders(child, pos)
+                        ],
+                    )
+                )
+
+        return rooms, doors
+
+    def _splits(self, region, border_doors):
+        """
+        The possible (axis, position) split walls of a region, along its
+        longer side if there are any.
+        """
+        x0, y0, x1, y1 = region
+        blocked_xs = {x for x, y in border_doors if y == y0 - 1 or y == y1}
+        blocked_ys = {y for x, y in border_doors if x == x0 - 1 or x == x1}
+        margin = self.min_room_size
+
+        splits = [
+            [(0, x) for x in range(x0 + margin, x1 - margin) if x not in blocked_xs],
+            [(1, y) for y in range(y0 + margin, y1 - margin) if y not in blocked_ys],
+        ]
+        longer = 0 if x1 - x0 >= y1 - y0 else 1
+
+        return splits[longer] or splits[1 - longer]
+
+    @staticmethod
+    def _borders(region, pos):
+        x0, y0, x1, y1 = region
+        x, y = pos
+        return ((x == x0 - 1 or x == x1) and y0 <= y < y1) or (
+            (y == y0 - 1 or y == y1) and x0 <= x < x1
+        )
@@ -0,0 +1,135 @@
+import copy
+import sys
+import threading
+import numpy as np
+from envs.constants import Config, config
+from envs.characters.cat import Cat
+from envs.characters.firefighter import FireFighter
+
+
+class GridState:
+    """
+    Copy of the parts of a grid the simulation changes during a step.
+    """
+
+    def __init__(self, grid):
+        self.layout = grid.tile_types
+        self.on_fire = grid.on_fire.copy()
+        self.durability = grid.durability.copy()
+        self.agent_location = grid.agent.location.copy()
+        self.agent_alive = grid.agent.is_alive
+        self.target_location = grid.target.location.copy()
+        self.extinguishing_pos = (
+            None
+            if grid.extinguishing_pos is None
+            else np.copy(grid.extinguishing_pos)
+        )
+
+
+def render_view(grid):
+    """
+    Returns a grid that shares the layout of `grid` but has its own fire
+    layers and characters, so it can be drawn and animated on another thread.
+    """
+    view = copy.copy(grid)
+    view._tiles = None
+    view.on_fire = grid.on_fire.copy()
+    view.durability = grid.durability.copy()
+    view.fire_state = grid.fire_state.copy()
+    view.target = Cat(grid.target.location.copy(), grid.config)
+    view.agent = FireFighter(grid.agent.location.copy(), grid.config)
+    view.extinguishing_pos = None
+    view.extinguishing_state = 0
+    view.is_animation_on_going = False
+
+    return view
+
+
+class RenderThread(threading.Thread):
+    """
+    Draws the latest published grid state at the window's frame rate.
+
+    The simulation only copies its state in `publish` and never waits for a
+    frame, states published between two frames are skipped. Sprite, fire
+    and put out fire animations belong to the render thread's own view of
+    the grid and advance with its clock, not with the simulation steps.
+    The window is created on this thread, all pygame calls stay on it.
+
+    macOS only lets the main thread open windows and read their events, so
+    this runs on Linux (and Windows) only, use the "human" mode on macOS.
+    """
+
+    def __init__(self, config: Config = config):
+        if sys.platform == "darwin":
+            raise Exception(
+                'Render mode "human_async" needs a window off the main thread, '
+                'which macOS does not allow, use "human" instead'
+            )
+
+        super().__init__(daemon=True)
+        self.config = config
+        self._lock = threading.Lock()
+        self._latest = None
+        self._view = None
+        self._grid = None
+        self._closing = threading.Event()
+
+    def publish(self, grid):
+        state = GridState(grid)
+        # the simulation keeps no animation state, the event now belongs to us
+        grid.extinguishing_pos = None
+
+        with self._lock:
+            if grid is not self._grid:
+                self._grid = grid
+                self._view = render_view(grid)
+            # a put out fire is not lost because a later state replaced it
+            elif state.extinguishing_pos is None and self._latest is not None:
+                state.extinguishing_pos = self._latest.extinguishing_pos
+            self._latest = state
+
+    def close(self):
+        self._closing.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        from envs.ui.window import Window
+        from envs.ui.renderer import GridRenderer
+
+        window = Window(self.config)
+        renderer = GridRenderer()
+
+        while not self._closing.is_set():
+            with self._lock:
+                view, state, self._latest = self._view, self._latest, None
+
+            if view is None:
+                window.idle()
+                continue
+
+            if state is not None and state.layout is view.tile_types:
+                self._apply(view, state)
+
+            window.draw(lambda canvas: renderer.draw(view, canvas), view.animate)
+
+        window.close()
+
+    @staticmethod
+    def _apply(view, state: GridState):
+        started = state.on_fire & ~view.on_fire
+        view.fire_state[started] = 0
+        view.on_fire[:] = state.on_fire
+        view.durability[:] = state.durability
+
+        view.target.location = state.target_location
+        if state.agent_alive and not view.agent.is_alive:
+            # a reset on the same layout
+            view.agent = FireFighter(state.agent_location, view.config)
+        view.agent.move(state.agent_location)
+        if view.agent.is_alive and not state.agent_alive:
+            view.agent.kill()
+
+        if state.extinguishing_pos is not None:
+            view.extinguishing_pos = state.extinguishing_pos
+            view.extinguishing_state = 0
@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+from envs.constants import TileType
+from envs.ui.sprites import load_srpite_map
+
+
+class GridRenderer:
+    """
+    Draws a grid frame by frame, redrawing only what changed.
+
+    Walls, floors and items are drawn once onto a background surface. On
+    every later frame only the tiles whose fire, destruction or occupancy
+    changed (plus the tile of the put out fire animation) are restored from
+    the background and drawn again. `draw` returns the rects of the canvas
+    it touched, ready for `pygame.display.update`.
+    """
+
+    def __init__(self):
+        self._tiles = None
+        self._background = None
+        self._fire = None
+        self._destroyed = None
+        self._characters = None
+        self._effect_pos = None
+
+    def draw(self, grid, canvas) -> list[pygame.Rect]:
+        load_srpite_map(grid.config)
+        if grid.tiles is not self._tiles or (
+            self._background.get_size() != canvas.get_size()
+        ):
+            return self._draw_all(grid, canvas)
+
+        fire, destroyed, characters = self._snapshot(grid)
+        dirty = (fire != self._fire) | (destroyed != self._destroyed)
+
+        for x, y in np.argwhere(destroyed != self._destroyed):
+            self._draw_background_tile(grid, x, y)
+
+        if characters != self._characters:
+            for x, y in self._characters[0] + self._characters[2]:
+                dirty[x, y] = True
+            for x, y in characters[0] + characters[2]:
+                dirty[x, y] = True
+
+        for pos in (self._effect_pos, grid.extinguishing_pos):
+            if pos is not None:
+                dirty[pos[0], pos[1]] = True
+
+        size = grid.config.square_size
+        rects = []
+        for x, y in np.argwhere(dirty):
+            rect = pygame.Rect(x * size, y * size, size, size)
+            canvas.blit(self._background, rect, rect)
+            if grid.on_fire[x, y]:
+                grid.tiles[x][y].draw(canvas)
+            rects.append(rect)
+
+        for character in (grid.target, grid.agent):
+            if dirty[character.x, character.y]:
+                character.draw(canvas)
+
+        self._draw_effects(grid, canvas)
+        self._fire, self._destroyed, self._characters = fire, destroyed, characters
+
+        return rects
+
+    def _draw_all(self, grid, canvas) -> list[pygame.Rect]:
+        self._tiles = grid.tiles
+        self._background = pygame.Surface(canvas.get_size())
+        self._background.fill((255, 255, 255))
+        for row in grid.tiles:
+            for tile in row:
+                tile.draw_background(self._background)
+
+        canvas.blit(self._background, (0, 0))
+        for x, y in np.argwhere(grid.on_fire):
+            grid.tiles[x][y].draw(canvas)
+
+        grid.target.draw(canvas)
+        grid.agent.draw(canvas)
+
+        self._draw_effects(grid, canvas)
+        self._fire, self._destroyed, self._characters = self._snapshot(grid)
+
+        return [canvas.get_rect()]
+
+    def _draw_background_tile(self, grid, x, y):
+        size = grid.config.square_size
+        self._background.fill((255, 255, 255), (x * size, y * size, size, size))
+        grid.tiles[x][y].draw_background(self._background)
+
+    def _draw_effects(self, grid, canvas):
+        # remembered so the tile is redrawn once the animation is over
+        self._effect_pos = (
+            None if grid.extinguishing_pos is None else tuple(grid.extinguishing_pos)
+        )
+        grid.draw_effects(canvas)
+
+    @staticmethod
+    def _snapshot(grid):
+        fire = np.where(grid.on_fire, grid.fire_state + 1, 0)
+        destroyed = (grid.tile_types == TileType.ITEM.value) & (grid.durability <= 0)
+        characters = (
+            [tuple(grid.agent.location)],
+            (grid.agent._anim_state, grid.agent.is_alive),
+            [tuple(grid.target.location)],
+            grid.target._anim_state,
+        )
+
+        return fire, destroyed, characters
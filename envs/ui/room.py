@@ -1,19 +1,20 @@
-from envs.constants import config, FloorType
-from envs.tiles.floor import Floor
+from envs.constants import FloorType, TileType
 
 
 class RoomFactory:
+    # the same layout for every grid, so an env builds it once and resets it
+    fixed_layout = True
+
     def create_walls(self, grid):
         pass
 
     def lay_floors(self, grid):
-        for x in range(config.grid_size):
-            for y in range(config.grid_size):
-                if not grid.tiles[x][y]:
-                    grid.tiles[x][y] = Floor(
+        for x in range(grid.config.grid_size):
+            for y in range(grid.config.grid_size):
+                if grid.tile_types[x, y] != TileType.WALL.value:
+                    grid.lay_floor(
                         x,
                         y,
-                        grid.tiles,
                         FloorType.PURPLE if x < 4 and y < 4 else FloorType.BLUE,
                     )
 
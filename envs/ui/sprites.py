@@ -1,34 +1,56 @@
 import pygame
-from envs.constants import config
+from envs.constants import Config, config
+import functools
+import hashlib
+import json
 import os  # Import os for path manipulation
+import threading
+import numpy as np
 
 # 8x28 is likely the dimension of the entire sprite sheet in terms of individual 16x16 sprites
 # 128x432 is the pixel dimension of the sheet
 ENV_SPRITE_ROWS = 27  # This seems correct for the "4 BigSet.png" if it's 16px sprites
 ENV_SPRITE_COLS = 8
-sprite_map = {}
+
+# processed sprites (recoloured, patched) are stored here per square size
+SPRITE_CACHE_DIR = ".sprite_cache"
+SPRITE_CACHE_VERSION = 1  # bump when a processing step changes
+
+# scaled variants, keyed by (sprite, size)
+_scaled = {}
 
 # --- Helper functions ---
 
 
-# Function to scale a single sprite to the config.square_size
-def scale(sprite, size=-1):
+# Function to scale a single sprite to a square size
+def scale(sprite, size):
+    """
+    Returns `sprite` scaled to `size` x `size`. Results are cached, so
+    callers that modify the returned surface have to copy it first.
+    """
     if sprite is None:
         return None
 
-    if size == -1:  # this is required for dynamically setting the config
-        size = config.square_size
+    key = (sprite, int(size))
+    if key not in _scaled:
+        _scaled[key] = pygame.transform.scale(sprite, (size, size))
+
+    return _scaled[key]
 
-    return pygame.transform.scale(sprite, (size, size))
+
+def load_image(filename):
+    image = pygame.image.load(filename)
+    # converting needs a display, sprites loaded before the window are converted as is
+    return image.convert_alpha() if pygame.display.get_surface() else image
 
 
 # Function to load a sprite sheet and chop it into individual sprites
-def load_sprite_sheet(filename, rows, cols, size):
-    if not config.is_rendering:
+def load_sprite_sheet(filename, rows, cols, size, is_rendering=True):
+    if not is_rendering:
         return [[None] * cols] * rows
 
     try:
-        sheet = pygame.image.load(filename).convert_alpha()
+        sheet = load_image(filename)
         sheet_rect = sheet.get_rect()
 
         sprites = []
@@ -83,8 +105,24 @@ def load_sprite_sheet(filename, rows, cols, size):
     return sprites
 
 
+@functools.cache
+def sprite_sheet(filename, rows, cols, size, is_rendering=True):
+    """Every sheet is read from disk once, on first use."""
+    return load_sprite_sheet(filename, rows, cols, size, is_rendering)
+
+
+@functools.cache
+def env_sprites(square_size, is_rendering=True):
+    return [
+        [scale(sprite, square_size) for sprite in sprite_list]
+        for sprite_list in sprite_sheet(
+            "assets/4 BigSet.png", ENV_SPRITE_ROWS, ENV_SPRITE_COLS, 16, is_rendering
+        )
+    ]
+
+
 # Function to load fire sprites specifically
-def load_fire_sprites():
+def load_fire_sprites(config: Config):
     if not config.is_rendering:
         return [None] * 4
 
@@ -92,7 +130,7 @@ def load_fire_sprites():
     try:
         for i in range(1, 5):  # Assumes Fogo_1.png to Fogo_4.png
             filepath = os.path.join("assets", "Fogo_" + str(i) + ".png")
-            sheet = pygame.image.load(filepath).convert_alpha()
+            sheet = load_image(filepath)
             # These values (1024/28, 16, piece*4) suggest a specific internal layout of your fire images
             # If Fogo_*.png are individual frames of fire animation, they should be loaded differently.
             # Assuming these are sheets that contain a specific fire sprite
@@ -101,7 +139,8 @@ def load_fire_sprites():
             frame = scale(
                 sheet.subsurface(
                     pygame.Rect(offset, offset, piece * 4, piece * 4)
-                ).copy()
+                ).copy(),
+                config.square_size,
             )
             fires.append(frame)
     except pygame.error as e:
@@ -111,21 +150,50 @@ def load_fire_sprites():
     return fires
 
 
-# --- Core sprite loading ---
+def hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip("#").lstrip("0x")
+    return int(hex_color[0:6], 16)
+
+
+FIREFIGHTER_COLORS = [
+    (hex_to_rgb(old), hex_to_rgb(new))
+    for old, new in [
+        ("#607581", "#672020"),  # Example color changes
+        ("#C2CDD2", "#8F3838"),
+        ("#9BADB7", "#672020"),
+        ("#C5D0D5", "#8F3838"),
+        ("#425C6B", "#561D1D"),
+        ("#5D6C75", "#561D1D"),
+        ("#6F828D", "#511D1D"),
+        ("#7F909A", "#511D1D"),
+        ("#7B4E16", "#B19E9A"),
+        ("#8D6534", "#B19E9A"),
+    ]
+]
 
-# Load the main environment sprite sheet
-# Pygame should only be initialized once for the main display loop.
-# Initializing and quitting pygame multiple times in load_sprite_sheet/load_fire_sprites
-# is generally bad practice and can lead to issues.
-# Let's ensure Pygame is initialized only once for the entire script.
 
-# Pygame initialization for the whole sprites.py file
-# A temporary display surface is still needed for image loading
+def recolor(sprite, colors):
+    """
+    Replaces the opaque pixels of every `old` colour with `new`, colours
+    given as 0xRRGGBB. Works on the whole pixel array instead of per pixel.
+    """
+    rgb = pygame.surfarray.pixels3d(sprite)
+    alpha = pygame.surfarray.pixels_alpha(sprite)
+    packed = (
+        rgb[..., 0].astype(np.int32) << 16
+        | rgb[..., 1].astype(np.int32) << 8
+        | rgb[..., 2]
+    )
 
-shadow_sheet = None
+    # every mask is taken before any pixel changes, like one pass per pixel
+    masks = [(packed == old) & (alpha == 255) for old, _ in colors]
+    for mask, (_, new) in zip(masks, colors):
+        rgb[mask] = ((new >> 16) & 255, (new >> 8) & 255, new & 255)
 
+    del rgb, alpha  # unlock the surface
 
-def fix_firefighter(sprite_100x100_sheet, with_shadow=True):
+
+def fix_firefighter(sprite_100x100_sheet, config: Config, with_shadow=True):
     if sprite_100x100_sheet is None:
         return None
     # This function expects a 100x100 sprite from the sheet and extracts a 24x24 sub-sprite
@@ -139,53 +207,24 @@ def fix_firefighter(sprite_100x100_sheet, with_shadow=True):
         pygame.Rect(x_offset_in_100, y_offset_in_100, size, size)
     ).copy()
     firefighter_sprite_scaled = scale(
-        firefighter_sprite_cut
-    )  # Scale to config.square_size
-
-    def hex_to_rgba(hex_color):
-        hex_color = hex_color.lstrip("#").lstrip("0x")
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return (r, g, b, 255)
-
-    colors_to_replace = [
-        (hex_to_rgba(old), hex_to_rgba(new))
-        for old, new in [
-            ("#607581", "#672020"),  # Example color changes
-            ("#C2CDD2", "#8F3838"),
-            ("#9BADB7", "#672020"),
-            ("#C5D0D5", "#8F3838"),
-            ("#425C6B", "#561D1D"),
-            ("#5D6C75", "#561D1D"),
-            ("#6F828D", "#511D1D"),
-            ("#7F909A", "#511D1D"),
-            ("#7B4E16", "#B19E9A"),
-            ("#8D6534", "#B19E9A"),
-        ]
-    ]
+        firefighter_sprite_cut, config.square_size
+    ).copy()  # Scale to config.square_size
 
-    # Apply color replacements
-    width, height = firefighter_sprite_scaled.get_size()
-    for x in range(width):
-        for y in range(height):
-            current_color = firefighter_sprite_scaled.get_at((x, y))
-            for old_color, new_color in colors_to_replace:
-                # Compare RGBA values, not just RGB, as alpha can be part of it
-                if current_color == old_color:
-                    firefighter_sprite_scaled.set_at((x, y), new_color)
-                    break  # Move to next pixel after replacement
+    recolor(firefighter_sprite_scaled, FIREFIGHTER_COLORS)
 
     if with_shadow:
         # Load and process shadow
         # Ensure Soldier-Shadow.png is a 100x100 sprite as well if it's from a sheet
+        shadow_sheet = sprite_sheet(
+            "assets/Soldier-Shadow.png", 1, 1, 100, config.is_rendering
+        )
         if shadow_sheet and shadow_sheet[0]:
             raw_shadow = shadow_sheet[0][0]
             # Extract the same 24x24 sub-sprite and scale it
             shadow_cut = raw_shadow.subsurface(
                 pygame.Rect(x_offset_in_100, y_offset_in_100, size, size)
             ).copy()
-            shadow_scaled = scale(shadow_cut)
+            shadow_scaled = scale(shadow_cut, config.square_size).copy()
             shadow_scaled.fill((0, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
             shadow_scaled.blit(
                 firefighter_sprite_scaled, (0, 0)
@@ -200,167 +239,322 @@ def fix_firefighter(sprite_100x100_sheet, with_shadow=True):
         return firefighter_sprite_scaled
 
 
-def fix_cat(sprite):
+def fix_cat(sprite, config: Config):
     return scale(sprite, config.square_size - 24)
 
 
-def load_srpite_map():
-    global sprite_map, shadow_sheet
-    pygame.init()
-    pygame.display.set_mode((1000, 1000), pygame.HIDDEN)
-    shadow_sheet = load_sprite_sheet("assets/Soldier-Shadow.png", 1, 1, 100)
+# Width of the black strips on the sides of the wall sprites
+WA = 7
 
-    env_sprites = [
-        [scale(sprite) for sprite in sprite_list]
-        for sprite_list in load_sprite_sheet(
-            "assets/4 BigSet.png", ENV_SPRITE_ROWS, ENV_SPRITE_COLS, 16
-        )
-    ]
 
-    map = {
-        "fires": load_fire_sprites(),
-        "firefighter": {
-            "idle": [
-                fix_firefighter(sprite)
-                for sprite in load_sprite_sheet("assets/Soldier-Idle.png", 1, 6, 100)[0]
-            ],
-            "dying": [
-                fix_firefighter(sprite)
-                for sprite in (
-                    load_sprite_sheet("assets/Soldier-Hurt.png", 1, 3, 100)[0]
-                    + load_sprite_sheet("assets/Soldier-Death.png", 1, 4, 100)[0]
-                )
-            ],
-            "put_out_fire": [
-                fix_firefighter(sprite, False)
-                for sprite in load_sprite_sheet(
-                    "assets/Soldier-Attack01_Effect.png", 1, 6, 100
-                )[0][3:5]
-            ],
-        },
-        "cat": [
-            fix_cat(sprite)
-            for sprite in load_sprite_sheet("assets/cat.png", 1, 4, 32)[0]
+def fix_walls(wall, config: Config):
+    """fix top wall black strips"""
+    if wall["top"] is None:
+        return wall
+
+    w = wall["top"].get_width()
+    for name in ["top", "front"]:
+        pixels = pygame.surfarray.pixels3d(wall[name])
+        alpha = pygame.surfarray.pixels_alpha(wall[name])
+        for channel in (pixels, alpha):
+            channel[:WA, : config.square_size] = channel[
+                WA, None, : config.square_size
+            ]
+            channel[w - WA :, : config.square_size] = channel[
+                w - WA - 6, None, : config.square_size
+            ]
+        del pixels, alpha
+
+    return wall
+
+
+def fix_wall_decoration(sprite, sprites):
+    """picture and window take the top rows of the wall they hang on"""
+    if sprite is None:
+        return sprite
+
+    front = sprites["wall"]["front"]
+    for source, target in [
+        (pygame.surfarray.pixels3d(front), pygame.surfarray.pixels3d(sprite)),
+        (pygame.surfarray.pixels_alpha(front), pygame.surfarray.pixels_alpha(sprite)),
+    ]:
+        target[: front.get_width(), :WA] = source[:, :1]
+
+    return sprite
+
+
+def load_carpet(sprites, color_i):
+    env = sprites.env_sprites()
+    map = {}
+    color_i *= 6
+
+    # order is top, bottom, right, left
+    for row, side in enumerate(["top", "middle", "bottom"]):
+        for col, direction in enumerate(["left", "center", "right"]):
+            map[side + "_" + direction] = {
+                "without_middle": env[color_i + row][col],
+                "with_middle": env[color_i + row][col + 3],
+                "without_border": env[color_i + row + 3][col],
+            }
+
+    map["top_right_left"] = env[color_i + 3][3]
+    map["right_left"] = env[color_i + 4][3]
+    map["bottom_right_left"] = env[color_i + 5][3]
+
+    map["top_bottom_left"] = env[color_i + 5][4]
+    map["top_bottom"] = env[color_i + 5][5]
+    map["top_bottom_right"] = env[color_i + 5][6]
+
+    map["top_bottom_right_left"] = env[color_i + 5][7]
+
+    return map
+
+
+def load_controll(name, size=(20, 20)):
+    return pygame.transform.scale(load_image(f"assets/{name}.svg"), size)
+
+
+# --- Core sprite loading ---
+
+# Every entry of the sprite map is built on first access. The entries which
+# take pixel work are stored in SPRITE_CACHE_DIR, so later launches load
+# them as they are.
+SPRITE_LOADERS = {
+    "fires": lambda sprites: load_fire_sprites(sprites.config),
+    "firefighter": lambda sprites: {
+        "idle": [
+            fix_firefighter(sprite, sprites.config)
+            for sprite in sprites.sheet("assets/Soldier-Idle.png", 1, 6, 100)[0]
         ],
-        "wall": {
-            "front": env_sprites[20][3],
-            "top": env_sprites[19][3],
-            "half": env_sprites[21][3],
-        },
-        "floor_tile": env_sprites[19][1],
-        "window": env_sprites[21][6],
-        "picture": env_sprites[21][7],
-        "bed": {
-            "red": env_sprites[23][0],
-            "blue": env_sprites[23][1],
-            "purple": env_sprites[23][2],
-        },
-        "bookshelf": {"full": env_sprites[23][3], "empty": env_sprites[23][4]},
-        "trap-doo": {
-            "closed": env_sprites[22][0],
-            "open": env_sprites[22][1],
-        },
-        "door": {
-            "closed": env_sprites[22][2],
-            "open": env_sprites[22][3],
-        },
-        "stool": env_sprites[23][5],
-        "table": {
-            "small": env_sprites[23][6],
-            "big": env_sprites[23][7],
-        },
-        "radio": env_sprites[24][0],
-        "night-stand": env_sprites[24][1],
-        "toilet": env_sprites[24][2],
-        "pot": {
-            "empty": env_sprites[24][3],
-            "green": env_sprites[24][4],
-            "pink": env_sprites[24][5],
-            "red": env_sprites[24][6],
-        },
-        "chest": env_sprites[24][7],
-        "chair": {
-            "red": env_sprites[25][2],
-            "blue": env_sprites[25][2],
-            "purple": env_sprites[25][3],
-        },
-        "bin": env_sprites[25][4],
-        "modern_bin": env_sprites[25][4],
-        "carpet": {
-            "up": env_sprites[26][1],
-            "middle": env_sprites[26][2],
-            "down": env_sprites[26][3],
-        },
-        "oven": env_sprites[26][4],
-        "controlls": {
-            "a": scale(pygame.image.load("assets/a.svg").convert_alpha(), 20),
-            "w": scale(pygame.image.load("assets/w.svg").convert_alpha(), 20),
-            "d": scale(pygame.image.load("assets/d.svg").convert_alpha(), 20),
-            "s": scale(pygame.image.load("assets/s.svg").convert_alpha(), 20),
-            "u": scale(pygame.image.load("assets/u.svg").convert_alpha(), 20),
-            "l": scale(pygame.image.load("assets/l.svg").convert_alpha(), 20),
-            "down": scale(pygame.image.load("assets/down.svg").convert_alpha(), 20),
-            "r": scale(pygame.image.load("assets/r.svg").convert_alpha(), 20),
-            "space": pygame.transform.scale(
-                pygame.image.load("assets/space.svg").convert_alpha(), (40, 30)
-            ),
+        "dying": [
+            fix_firefighter(sprite, sprites.config)
+            for sprite in (
+                sprites.sheet("assets/Soldier-Hurt.png", 1, 3, 100)[0]
+                + sprites.sheet("assets/Soldier-Death.png", 1, 4, 100)[0]
+            )
+        ],
+        "put_out_fire": [
+            fix_firefighter(sprite, sprites.config, False)
+            for sprite in sprites.sheet(
+                "assets/Soldier-Attack01_Effect.png", 1, 6, 100
+            )[0][3:5]
+        ],
+    },
+    "cat": lambda sprites: [
+        fix_cat(sprite, sprites.config)
+        for sprite in sprites.sheet("assets/cat.png", 1, 4, 32)[0]
+    ],
+    "wall": lambda sprites: fix_walls(
+        {
+            "front": sprites.env_sprites()[20][3],
+            "top": sprites.env_sprites()[19][3],
+            "half": sprites.env_sprites()[21][3],
         },
-    }
+        sprites.config,
+    ),
+    "floor_tile": lambda sprites: sprites.env_sprites()[19][1],
+    "window": lambda sprites: fix_wall_decoration(
+        sprites.env_sprites()[21][6], sprites
+    ),
+    "picture": lambda sprites: fix_wall_decoration(
+        sprites.env_sprites()[21][7], sprites
+    ),
+    "bed": lambda sprites: {
+        "red": sprites.env_sprites()[23][0],
+        "blue": sprites.env_sprites()[23][1],
+        "purple": sprites.env_sprites()[23][2],
+    },
+    "bookshelf": lambda sprites: {
+        "full": sprites.env_sprites()[23][3],
+        "empty": sprites.env_sprites()[23][4],
+    },
+    "trap-doo": lambda sprites: {
+        "closed": sprites.env_sprites()[22][0],
+        "open": sprites.env_sprites()[22][1],
+    },
+    "door": lambda sprites: {
+        "closed": sprites.env_sprites()[22][2],
+        "open": sprites.env_sprites()[22][3],
+    },
+    "stool": lambda sprites: sprites.env_sprites()[23][5],
+    "table": lambda sprites: {
+        "small": sprites.env_sprites()[23][6],
+        "big": sprites.env_sprites()[23][7],
+    },
+    "radio": lambda sprites: sprites.env_sprites()[24][0],
+    "night-stand": lambda sprites: sprites.env_sprites()[24][1],
+    "toilet": lambda sprites: sprites.env_sprites()[24][2],
+    "pot": lambda sprites: {
+        "empty": sprites.env_sprites()[24][3],
+        "green": sprites.env_sprites()[24][4],
+        "pink": sprites.env_sprites()[24][5],
+        "red": sprites.env_sprites()[24][6],
+    },
+    "chest": lambda sprites: sprites.env_sprites()[24][7],
+    "chair": lambda sprites: {
+        "red": sprites.env_sprites()[25][2],
+        "blue": sprites.env_sprites()[25][2],
+        "purple": sprites.env_sprites()[25][3],
+    },
+    "bin": lambda sprites: sprites.env_sprites()[25][4],
+    "modern_bin": lambda sprites: sprites.env_sprites()[25][4],
+    "carpet": lambda sprites: {
+        "up": sprites.env_sprites()[26][1],
+        "middle": sprites.env_sprites()[26][2],
+        "down": sprites.env_sprites()[26][3],
+    },
+    "oven": lambda sprites: sprites.env_sprites()[26][4],
+    "controlls": lambda sprites: {
+        "a": load_controll("a"),
+        "w": load_controll("w"),
+        "d": load_controll("d"),
+        "s": load_controll("s"),
+        "u": load_controll("u"),
+        "l": load_controll("l"),
+        "down": load_controll("down"),
+        "r": load_controll("r"),
+        "space": load_controll("space", (40, 30)),
+    },
+    "red_carpet": lambda sprites: load_carpet(sprites, 0),
+    "blue_carpet": lambda sprites: load_carpet(sprites, 1),
+    "purple_carpet": lambda sprites: load_carpet(sprites, 2),
+}
+
+PROCESSED_SPRITES = ["firefighter", "wall", "window", "picture"]
+
+
+@functools.cache
+def assets_fingerprint():
+    digest = hashlib.sha256(str(SPRITE_CACHE_VERSION).encode())
+    for name in sorted(os.listdir("assets")):
+        stat = os.stat(os.path.join("assets", name))
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    return digest.hexdigest()[:16]
+
+
+def _cache_path(name, square_size):
+    return os.path.join(
+        SPRITE_CACHE_DIR, f"{name}.{square_size}.{assets_fingerprint()}.npz"
+    )
+
+
+def _pack(entry, arrays):
+    if isinstance(entry, dict):
+        return {key: _pack(value, arrays) for key, value in entry.items()}
+    if isinstance(entry, list):
+        return [_pack(value, arrays) for value in entry]
+
+    name = f"s{len(arrays)}"
+    width, height = entry.get_size()
+    arrays[name] = np.frombuffer(
+        pygame.image.tobytes(entry, "RGBA"), dtype=np.uint8
+    ).reshape(height, width, 4)
+    return name
+
+
+def _unpack(layout, arrays):
+    if isinstance(layout, dict):
+        return {key: _unpack(value, arrays) for key, value in layout.items()}
+    if isinstance(layout, list):
+        return [_unpack(value, arrays) for value in layout]
+
+    pixels = arrays[layout]
+    sprite = pygame.image.frombytes(
+        pixels.tobytes(), (pixels.shape[1], pixels.shape[0]), "RGBA"
+    )
+    return sprite.convert_alpha() if pygame.display.get_surface() else sprite
+
+
+def load_processed_sprite(sprites, name):
+    path = _cache_path(name, sprites.config.square_size)
+    try:
+        with np.load(path) as arrays:
+            return _unpack(json.loads(str(arrays["layout"])), arrays)
+    except (OSError, ValueError, KeyError):
+        pass
 
-    sprite_map.update(map)
+    entry = SPRITE_LOADERS[name](sprites)
 
-    for color_i, color in enumerate(["red", "blue", "purple"]):
-        map = {}
-        color_i *= 6
+    arrays = {}
+    layout = _pack(entry, arrays)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    try:
+        os.makedirs(SPRITE_CACHE_DIR, exist_ok=True)
+        np.savez(tmp_path, layout=json.dumps(layout), **arrays)
+        os.replace(tmp_path, path)
+    except OSError:  # e.g. a read-only file system in the browser build
+        pass
 
-        # order is top, bottom, right, left
-        for row, side in enumerate(["top", "middle", "bottom"]):
-            for col, direction in enumerate(["left", "center", "right"]):
-                map[side + "_" + direction] = {
-                    "without_middle": env_sprites[color_i + row][col],
-                    "with_middle": env_sprites[color_i + row][col + 3],
-                    "without_border": env_sprites[color_i + row + 3][col],
-                }
+    return entry
 
-        map["top_right_left"] = env_sprites[color_i + 3][3]
-        map["right_left"] = env_sprites[color_i + 4][3]
-        map["bottom_right_left"] = env_sprites[color_i + 5][3]
 
-        map["top_bottom_left"] = env_sprites[color_i + 5][4]
-        map["top_bottom"] = env_sprites[color_i + 5][5]
-        map["top_bottom_right"] = env_sprites[color_i + 5][6]
+class SpriteMap(dict):
+    """
+    The sprites for one `config`, its entries are loaded the first time
+    they are used.
+    """
 
-        map["top_bottom_right_left"] = env_sprites[color_i + 5][7]
+    def __init__(self, config: Config = config):
+        super().__init__()
+        self.config = config
 
-        sprite_map[color + "_carpet"] = map
+    def sheet(self, filename, rows, cols, size):
+        return sprite_sheet(filename, rows, cols, size, self.config.is_rendering)
 
-    if not config.is_rendering:
-        return
-
-    # fix top wall black strips
-    w = scale(sprite_map["wall"]["top"]).get_width()
-    WA = 7
-    for y in range(config.square_size):
-        for x in range(WA):
-            sprite_map["wall"]["top"].set_at(
-                (x, y), sprite_map["wall"]["top"].get_at((WA, y))
-            )
-            sprite_map["wall"]["top"].set_at(
-                (w - 1 - x, y),
-                sprite_map["wall"]["top"].get_at((w - WA - 6, y)),
-            )
-            sprite_map["wall"]["front"].set_at(
-                (x, y), sprite_map["wall"]["front"].get_at((WA, y))
-            )
-            sprite_map["wall"]["front"].set_at(
-                (w - 1 - x, y),
-                sprite_map["wall"]["front"].get_at((w - WA - 6, y)),
-            )
+    def env_sprites(self):
+        return env_sprites(self.config.square_size, self.config.is_rendering)
+
+    def __missing__(self, name):
+        if name not in SPRITE_LOADERS:
+            raise KeyError(name)
+
+        if self.config.is_rendering and name in PROCESSED_SPRITES:
+            sprite = load_processed_sprite(self, name)
+        else:
+            sprite = SPRITE_LOADERS[name](self)
+
+        self[name] = sprite
+        return sprite
+
+
+# one sprite map per square size, shared by the configs rendering at it
+_sprite_maps = {}
+_active = threading.local()
+
+
+def load_srpite_map(render_config: Config = config) -> SpriteMap:
+    """
+    Selects the sprites for `render_config` in the calling thread and
+    returns them. Nothing is read from disk until a sprite is used, so
+    environments of different square sizes can render in one process.
+    """
+    key = (render_config.square_size, render_config.is_rendering)
+    if key not in _sprite_maps:
+        _sprite_maps[key] = SpriteMap(render_config)
+
+    _active.sprite_map = _sprite_maps[key]
+    return _active.sprite_map
+
+
+class ActiveSpriteMap:
+    """
+    The sprite map last selected by `load_srpite_map` in the calling
+    thread, the one for the default config if there is none.
+    """
+
+    def _current(self) -> SpriteMap:
+        current = getattr(_active, "sprite_map", None)
+        return current if current is not None else load_srpite_map()
+
+    def __getitem__(self, name):
+        return self._current()[name]
+
+    def __contains__(self, name):
+        return name in self._current()
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
 
-    for x in range(w):
-        for y in range(WA):
-            c = sprite_map["wall"]["front"].get_at((x, 0))
-            sprite_map["picture"].set_at((x, y), c)
-            sprite_map["window"].set_at((x, y), c)
 
-    pygame.quit()
+sprite_map = ActiveSpriteMap()
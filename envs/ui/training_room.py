@@ -1,7 +1,6 @@
 import numpy as np
 from envs.ui.room import RoomFactory
-from envs.tiles.item import Item, Items
-from envs.tiles.wall import Wall
+from envs.constants import Items
 
 
 class TrainingRoom(RoomFactory):
@@ -19,14 +18,11 @@ class TrainingRoom(RoomFactory):
         ]
 
         for pos in positions:
-            grid.tiles[pos[0]][pos[1]] = Wall(pos[0], pos[1])
-
-        for pos in positions:
-            grid.tiles[pos[0]][pos[1]].register_neighbors(grid.tiles)
+            grid.place_wall(pos[0], pos[1])
 
     def create_items(self, grid):
         super().create_items(grid)
 
-        grid.tiles[0][3] = Item(grid.tiles[0][3], Items.BOOKSHELF_FULL)
-        grid.tiles[1][0] = Item(grid.tiles[1][0], Items.BED_RED)
-        grid.tiles[2][0] = Item(grid.tiles[2][0], Items.POT_GREEN)
+        grid.place_item(0, 3, Items.BOOKSHELF_FULL)
+        grid.place_item(1, 0, Items.BED_RED)
+        grid.place_item(2, 0, Items.POT_GREEN)
@@ -0,0 +1,145 @@
+import queue
+import shutil
+import subprocess
+import threading
+import numpy as np
+
+
+class VideoRecorder:
+    """
+    Encodes episodes to video files on a background thread, so rollouts do
+    not wait on the encoder. Frames are copied into a fixed pool of buffers
+    which go back to the pool once written, `add_frame` only blocks while
+    every buffer is still queued. Episodes are encoded one after another by
+    piping raw RGB frames to ffmpeg, which has to be on the PATH.
+
+        recorder = VideoRecorder((512, 512, 3))
+        recorder.start_episode("episode_0.mp4")
+        for ...:
+            env.step(action)
+            recorder.add_frame(env.render())
+        recorder.end_episode()
+        recorder.close()
+    """
+
+    def __init__(self, frame_shape, fps=30, pool_size=64, ffmpeg="ffmpeg"):
+        self.ffmpeg = shutil.which(ffmpeg)
+        if self.ffmpeg is None:
+            raise Exception(f"Video encoder {ffmpeg} not found")
+
+        self.frame_shape = tuple(frame_shape)
+        self.fps = fps
+        self.error = None
+        # the ffmpeg process of the episode being encoded
+        self._process = None
+
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(np.empty(self.frame_shape, dtype=np.uint8))
+
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._encode, daemon=True)
+        self._thread.start()
+
+    def start_episode(self, path):
+        self._jobs.put(("start", path))
+
+    def add_frame(self, frame):
+        buffer = self._pool.get()
+        np.copyto(buffer, frame)
+        self._jobs.put(("frame", buffer))
+
+    def end_episode(self):
+        self._jobs.put(("end", None))
+
+    def close(self):
+        """
+        Waits until every queued episode is written.
+        """
+        try:
+            self._jobs.put(None)
+            self._thread.join()
+        finally:
+            self._kill()
+
+        if self.error is not None:
+            raise self.error
+
+    def _command(self, path):
+        height, width, _ = self.frame_shape
+        return [
+            self.ffmpeg,
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "rgb24",
+            "-s",
+            f"{width}x{height}",
+            "-r",
+            str(self.fps),
+            "-i",
+            "-",
+            "-pix_fmt",
+            "yuv420p",
+            path,
+        ]
+
+    def _encode(self):
+        try:
+            while (job := self._jobs.get()) is not None:
+                self._run(*job)
+
+            if self._process is not None and self.error is None:
+                self._finish()
+        except Exception as error:
+            self.error = error
+        finally:
+            self._kill()
+
+    def _run(self, kind, value):
+        # after a failure the remaining jobs are only drained
+        if self.error is not None:
+            if kind == "frame":
+                self._pool.put(value)
+            return
+
+        try:
+            if kind == "start":
+                self._process = subprocess.Popen(
+                    self._command(value), stdin=subprocess.PIPE
+                )
+            elif kind == "frame":
+                self._process.stdin.write(memoryview(value).cast("B"))
+            elif kind == "end":
+                self._finish()
+        except Exception as error:
+            # e.g. a BrokenPipeError, ffmpeg would otherwise be left running
+            self.error = error
+            self._kill()
+        finally:
+            if kind == "frame":
+                self._pool.put(value)
+
+    def _finish(self):
+        process, self._process = self._process, None
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass  # ffmpeg exited early, its exit code tells why
+        if process.wait() != 0:
+            raise Exception(f"Video encoder exited with code {process.returncode}")
+
+    def _kill(self):
+        process, self._process = self._process, None
+        if process is None:
+            return
+
+        process.kill()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        process.wait()
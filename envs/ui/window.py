@@ -1,8 +1,8 @@
 from envs.constants import Action
 import pygame
-from envs.ui.sprites import sprite_map
+from envs.ui.sprites import sprite_map, load_srpite_map
 import asyncio
-from envs.constants import config
+from envs.constants import Config, config
 import numpy as np
 import math
 
@@ -13,7 +13,12 @@ BLACK = (0, 0, 0)
 
 
 class Window:
-    def __init__(self):
+    def __init__(self, config: Config = config):
+        self.config = config
+
+        # the sprites are scaled for the window's squares
+        load_srpite_map(config)
+
         pygame.init()
         pygame.display.init()
 
@@ -37,10 +42,10 @@ class Window:
                     0, 0, self.controllBtnSize, self.controllBtnSize
                 )
                 self.controlls[controll]["btn"].center = (
-                    config.window_size
+                    self.config.window_size
                     - (self.controlls[controll]["pos"][1] + 1) * self.controllBtnSize
                     + 2,
-                    config.window_size
+                    self.config.window_size
                     - (self.controlls[controll]["pos"][0] + 1) * self.controllBtnSize,
                 )
 
@@ -49,9 +54,9 @@ class Window:
                     0, 0, self.controllBtnSize, self.controllBtnSize
                 )
                 self.controlls[controll]["btn"].center = (
-                    config.window_size
+                    self.config.window_size
                     - (self.controlls[controll]["pos"][1] + 1) * self.controllBtnSize,
-                    config.window_size
+                    self.config.window_size
                     - (self.controlls[controll]["pos"][0] + 1) * self.controllBtnSize,
                 )
 
@@ -70,58 +75,73 @@ class Window:
             self._extra_small_font = pygame.font.SysFont("Courier", 12)
             self._extra_extra_small_font = pygame.font.SysFont("Courier", 8)
 
-        self._canvas = pygame.Surface((config.window_size, config.window_size))
+        window_size = (self.config.window_size, self.config.window_size)
+        self._canvas = pygame.Surface(window_size)
         self._canvas.fill((255, 255, 255))
-        self._screen = pygame.display.set_mode((config.window_size, config.window_size))
+        self._screen = pygame.display.set_mode(window_size)
         self._clock = pygame.time.Clock()
         self._animation_stage = 0
 
+        self._space_text = self._extra_extra_small_font.render("Space", True, BLACK)
+        self._space_text_rect = self._space_text.get_rect(
+            center=(
+                self.config.window_size
+                - self.controlls["space"]["pos"][1] * self.controllBtnSize
+                - 10,
+                self.config.window_size
+                - self.controlls["space"]["pos"][1] * self.controllBtnSize
+                + 20,
+            )
+        )
+        self._controlls_rect = self._space_text_rect.unionall(
+            [controll["btn"] for controll in self.controlls.values()]
+        )
+        self._full_update = True
+
     def draw(self, draw_func, animate_func):
-        if self._animation_stage >= config.fps * config.animation_delay:
+        """
+        `draw_func` draws onto the canvas and may return the rects it changed,
+        then only those are copied to the screen and updated.
+        """
+        load_srpite_map(self.config)
+        if self._animation_stage >= self.config.fps * self.config.animation_delay:
             animate_func()
             self._animation_stage = 0
         else:
-            self._animation_stage += config.fps
+            self._animation_stage += self.config.fps
 
-        draw_func(self._canvas)
+        dirty_rects = draw_func(self._canvas)
 
-        self._screen.blit(self._canvas, self._canvas.get_rect())
-        self.draw_controlls()
+        if dirty_rects is None or self._full_update:
+            self._screen.blit(self._canvas, self._canvas.get_rect())
+            self.draw_controlls()
+            dirty_rects = [self._screen.get_rect()]
+            self._full_update = False
+        else:
+            for rect in dirty_rects:
+                self._screen.blit(self._canvas, rect, rect)
+
+            if self._controlls_rect.collidelist(dirty_rects) != -1:
+                self.draw_controlls()
+                dirty_rects.append(self._controlls_rect)
+
+        pygame.event.pump()
+        pygame.display.update(dirty_rects)
+        self._clock.tick(self.config.fps)
 
+    def idle(self):
+        """Keeps the window responsive while there is nothing to draw."""
         pygame.event.pump()
-        pygame.display.update()
-        self._clock.tick(config.fps)
+        self._clock.tick(self.config.fps)
 
     def draw_controlls(self):
         for controll in self.controlls.keys():
-            if controll == "space":
-                self._screen.blit(
-                    sprite_map["controlls"][controll],
-                    self.controlls[controll]["btn"].topleft,
-                )
-
-                text = self._extra_extra_small_font.render("Space", True, BLACK)
-                self._screen.blit(
-                    text,
-                    text.get_rect(
-                        center=(
-                            config.window_size
-                            - self.controlls[controll]["pos"][1] * self.controllBtnSize
-                            - 10,
-                            config.window_size
-                            - self.controlls[controll]["pos"][1] * self.controllBtnSize
-                            + 20,
-                        )
-                    ),
-                )
-
-            else:
-                self._screen.blit(
-                    sprite_map["controlls"][controll],
-                    self.controlls[controll]["btn"].topleft,
-                )
+            self._screen.blit(
+                sprite_map["controlls"][controll],
+                self.controlls[controll]["btn"].topleft,
+            )
 
-        pygame.display.flip()
+        self._screen.blit(self._space_text, self._space_text_rect)
 
     def close(self):
         if self._screen is not None:
@@ -129,6 +149,7 @@ class Window:
             pygame.quit()
 
     async def game_over_screen(self):
+        self._full_update = True
         self._draw_game_over()
         while True:
             await asyncio.sleep(0)
@@ -165,15 +186,15 @@ class Window:
                         self._screen.blit(self._canvas, self._canvas.get_rect())
                         self._draw_game_over(hover_yes, hover_no)
 
-            self._clock.tick(config.fps)
+            self._clock.tick(self.config.fps)
 
     def _draw_game_over(self, hover_yes=False, hover_no=False):
-        dim_overlay = pygame.Surface((config.window_size, config.window_size))
+        dim_overlay = pygame.Surface(self._canvas.get_size())
         dim_overlay.set_alpha(180)
         dim_overlay.fill(BLACK)
         self._screen.blit(dim_overlay, (0, 0))
 
-        self._center = config.window_size // 2
+        self._center = self.config.window_size // 2
 
         # Game Over text
         text = self._font.render("Game Over", True, RED)
@@ -239,7 +260,10 @@ class Window:
         pygame.draw.rect(self._screen, BLACK if hover_no else RED, underline_n)
 
     async def win_screen(self):
-        confetti_list = [ConfettiParticle() for _ in range(150)]
+        self._full_update = True
+        confetti_list = [
+            ConfettiParticle(self.config.window_size) for _ in range(150)
+        ]
         self._draw_congrats(confetti_list)
 
         while True:
@@ -278,15 +302,15 @@ class Window:
                         elif self._no_rect.collidepoint(event.pos):
                             return False
 
-            self._clock.tick(config.fps)
+            self._clock.tick(self.config.fps)
 
     def _draw_congrats(self, confetti, hover_yes=False, hover_no=False):
-        dim_overlay = pygame.Surface((config.window_size, config.window_size))
+        dim_overlay = pygame.Surface(self._canvas.get_size())
         dim_overlay.set_alpha(180)
         dim_overlay.fill(BLACK)
         self._screen.blit(dim_overlay, (0, 0))
 
-        self._center = config.window_size // 2
+        self._center = self.config.window_size // 2
 
         text = self._font.render("Congrats!!", True, GREEN)
         text_rect = text.get_rect(center=(self._center, self._center - 60))
@@ -301,8 +325,9 @@ class Window:
 
 
 class ConfettiParticle:
-    def __init__(self):
-        self.x = np.random.uniform(0, config.window_size)
+    def __init__(self, window_size: int):
+        self.window_size = window_size
+        self.x = np.random.uniform(0, window_size)
         self.y = np.random.uniform(-100, -10)
         self.size = np.random.randint(4, 7)
         colors = ((255, 0, 0), (0, 255, 0), (0, 150, 255), (255, 255, 0), (255, 0, 255))
@@ -318,7 +343,7 @@ class ConfettiParticle:
         self.x += self.drift
         self.angle = (self.angle + self.spin) % 360
 
-        if self.y > config.window_size:
+        if self.y > self.window_size:
             self.y = 0
 
     def draw(self, surface):
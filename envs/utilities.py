@@ -1,60 +1,110 @@
 import numpy as np
-from envs.tiles.tile import Tile
 from envs.tiles.base import Base
 from envs.constants import config
 
 
-def decide_action(chance):
-    return np.random.rand() < chance
+# independent substreams of one environment's seeded generator
+RANDOM_STREAMS = ["layout", "fire", "exploration"]
+
+
+def random_streams(np_random: np.random.Generator) -> dict[str, np.random.Generator]:
+    """
+    Spawns one generator per stochastic part of an environment. Draws in
+    one stream never shift another, e.g. a longer rollout does not change
+    the next layout, and processes seeded differently never share state.
+    """
+    return dict(zip(RANDOM_STREAMS, np_random.spawn(len(RANDOM_STREAMS))))
+
+
+def decide_action(chance, np_random: np.random.Generator):
+    return np_random.random() < chance
 
 
 def random_tile(
-    tiles: list[list[Tile]],
-    target: Base,
-    agent: Base,
-    inflammable: bool | None = None,
-    burning: bool | None = None,
-) -> Tile | None:
-    possible_tiles: list[Tile] = []
-    for row in tiles:
-        for tile in row:
-            if not is_occupied(tile, target) and not is_occupied(tile, agent):
-                possible_tiles.append(tile)
-
-    if inflammable is not None:
-        possible_tiles = [
-            tile for tile in possible_tiles if tile.is_inflammable == inflammable
-        ]
-
-    if burning is not None:
-        possible_tiles = [tile for tile in possible_tiles if tile.is_on_fire == burning]
-
-    if not possible_tiles:
+    candidates: np.ndarray,
+    target: Base | None,
+    agent: Base | None,
+    np_random: np.random.Generator,
+) -> tuple[int, int] | None:
+    """
+    Picks a random position among the `candidates` mask, skipping the
+    tiles occupied by the target and the agent.
+    """
+    candidates = candidates.copy()
+    for entity in (target, agent):
+        if entity is not None:
+            candidates[entity.x, entity.y] = False
+
+    possible_tiles = np.flatnonzero(candidates)
+    if len(possible_tiles) == 0:
         return None
 
-    return np.random.choice(possible_tiles)
+    return np.unravel_index(np_random.choice(possible_tiles), candidates.shape)
+
+
+def out_of_grid(pos: tuple[int], grid_size: int = None):
+    if grid_size is None:
+        grid_size = config.grid_size
+
+    return pos[0] < 0 or pos[0] >= grid_size or pos[1] < 0 or pos[1] >= grid_size
+
+
+class ObservationEncoder:
+    """
+    Maps (agent, target, is_fire_present) observations to a flat state index,
+    laid out as (target_x, target_y, is_fire_present, agent_x, agent_y) so a
+    q-table of shape (num_states, actions) matches the old 6-D table reshaped.
+    """
+
+    def __init__(self, grid_size=None):
+        size = grid_size if grid_size is not None else config.grid_size
+
+        self.num_states = 2 * size**4
+        self._agent_x_stride = size
+        self._fire_stride = size * size
+        self._target_y_stride = 2 * self._fire_stride
+        self._target_x_stride = size * self._target_y_stride
 
+    def encode(self, observation) -> int:
+        agent, target, is_fire_present = observation
+        return int(
+            target[0] * self._target_x_stride
+            + target[1] * self._target_y_stride
+            + is_fire_present * self._fire_stride
+            + agent[0] * self._agent_x_stride
+            + agent[1]
+        )
 
-def is_occupied(tile: Tile, entity: Base):
-    return tile.x == entity.x and tile.y == entity.y
+    def decode(self, state: int):
+        target_x, rest = divmod(state, self._target_x_stride)
+        target_y, rest = divmod(rest, self._target_y_stride)
+        is_fire_present, rest = divmod(rest, self._fire_stride)
+        agent_x, agent_y = divmod(rest, self._agent_x_stride)
 
+        return (
+            np.array([agent_x, agent_y]),
+            np.array([target_x, target_y]),
+            bool(is_fire_present),
+        )
 
-def out_of_grid(pos: tuple[int]):
-    return (
-        pos[0] < 0
-        or pos[0] >= config.grid_size
-        or pos[1] < 0
-        or pos[1] >= config.grid_size
-    )
+    def encode_batch(self, observations) -> np.ndarray:
+        agent, target, is_fire_present = observations
+        return (
+            target[:, 0] * self._target_x_stride
+            + target[:, 1] * self._target_y_stride
+            + is_fire_present * self._fire_stride
+            + agent[:, 0] * self._agent_x_stride
+            + agent[:, 1]
+        )
 
 
-def decide_random_action(q_values):
-    return np.random.randint(0, len(q_values))
+def decide_random_action(q_values, np_random: np.random.Generator):
+    return np_random.integers(0, len(q_values))
 
     if all(q_value == 0 for q_value in q_values):
-        return np.random.randint(0, len(q_values))
+        return np_random.integers(0, len(q_values))
     elif all(q_value < 0 for q_value in q_values):
-        val = np.random.uniform(sum(q_values), 0)
+        val = np_random.uniform(sum(q_values), 0)
 
         for i, q_value in enumerate(q_values):
             val -= q_value
@@ -70,7 +120,7 @@ def decide_random_action(q_values):
                 q_values[i] = 0
 
         q_value_sum = sum(q_values)
-        val = np.random.uniform(0, q_value_sum)
+        val = np_random.uniform(0, q_value_sum)
         for i, q_value in enumerate(q_values):
             val -= q_value
             print(val)
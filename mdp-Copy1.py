@@ -7,7 +7,7 @@ import sys
 import os
 from envs.ui.sprites import load_srpite_map
 
-from envs.constants import config, Action
+from envs.constants import Config, config, Action
 from envs.grid import Grid
 from envs.ui.training_room import TrainingRoom
 
@@ -15,8 +15,6 @@ from envs.ui.training_room import TrainingRoom
 LEARN = True
 N_EPISODES = 1000
 
-load_srpite_map()
-
 
 gym.envs.registration.register(
     id="FireFighterWorld-v0",
@@ -25,14 +23,16 @@ gym.envs.registration.register(
 
 
 class FireEvacuationAgentMDP:
-    def __init__(self, seed=None):
-        self.np_random = np.random.RandomState(seed)
+    def __init__(self, seed=None, config: Config = config):
+        self.config = config
+        self.np_random = np.random.default_rng(seed)
         self.grid_template = Grid(
             TrainingRoom(),
             static_mode=True,
             initial_agent_pos=np.array([0, 0]),
             initial_target_pos=np.array([0, 0]),
             np_random=self.np_random,
+            config=config,
         )
         self.rows = config.grid_size
         self.cols = config.grid_size
@@ -47,10 +47,7 @@ class FireEvacuationAgentMDP:
         self.possible_traversable_positions = []
         for y in range(self.rows):
             for x in range(self.cols):
-                if (
-                    self.grid_template.tiles[x][y]
-                    and self.grid_template.tiles[x][y].is_traversable
-                ):
+                if self.grid_template.traversable[x, y]:
                     self.possible_traversable_positions.append((x, y))
         self.states = self._define_states()
         self.num_states = len(self.states)
@@ -76,7 +73,9 @@ class FireEvacuationAgentMDP:
 
     def _build_transition_probabilities(self) -> np.ndarray:
         P = np.zeros((self.num_states, len(self.actions), self.num_states))
-        env_simulator = gym.make("FireFighterWorld", render_mode=None, static_mode=True)
+        env_simulator = gym.make(
+            "FireFighterWorld", render_mode=None, static_mode=True, config=self.config
+        )
         slip_prob = 0.2
 
         for s_idx, (ax, ay, tx, ty) in enumerate(self.states):
@@ -129,7 +128,9 @@ class FireEvacuationAgentMDP:
 
     def _build_reward_function(self) -> np.ndarray:
         R = np.zeros((self.num_states, len(self.actions)))
-        env_simulator = gym.make("FireFighterWorld", render_mode=None, static_mode=True)
+        env_simulator = gym.make(
+            "FireFighterWorld", render_mode=None, static_mode=True, config=self.config
+        )
 
         for s_idx, (ax, ay, tx, ty) in enumerate(self.states):
             current_agent_pos = np.array([ax, ay])
@@ -152,7 +153,7 @@ class FireEvacuationAgentMDP:
 
     def value_iteration(self, epsilon=1e-6):
         V = np.copy(self.value_function)
-        gamma = config.discount_factor
+        gamma = self.config.discount_factor
         iteration = 0
         while True:
             iteration += 1
@@ -229,9 +230,11 @@ sys.path.insert(0, os.path.abspath("."))
 
 
 # Ensure your constants are set up for a static environment for MDP
-config.chance_of_catching_fire = 0
-config.chance_of_self_extinguish = 0
-config.static_fire_mode = True
+config = config.replace(
+    chance_of_catching_fire=0,
+    chance_of_self_extinguish=0,
+    static_fire_mode=True,
+)
 
 print(f"Running in static fire mode: {config.static_fire_mode}")
 print(f"Grid size: {config.grid_size}")
@@ -242,7 +245,7 @@ print(f"Discount factor: {config.discount_factor}")
 LEARN = True
 N_EPISODES = 1000
 
-load_srpite_map()
+load_srpite_map(config)
 
 
 class Metrics:
@@ -325,14 +328,18 @@ gym.envs.registration.register(
 )
 
 
-config.chance_of_catching_fire = 0
-config.chance_of_self_extinguish = 0
-config.static_fire_mode = True
+config = config.replace(
+    chance_of_catching_fire=0,
+    chance_of_self_extinguish=0,
+    static_fire_mode=True,
+)
 
 
 def run_mdp_simulation_with_metrics(num_episodes=N_EPISODES):
-    mdp_solver = FireEvacuationAgentMDP(seed=42)
-    env = gym.make("FireFighterWorld-v0", render_mode="human", static_mode=True)
+    mdp_solver = FireEvacuationAgentMDP(seed=42, config=config)
+    env = gym.make(
+        "FireFighterWorld-v0", render_mode="human", static_mode=True, config=config
+    )
     metrics = Metrics()
 
     preset_fire_positions = [(5, 0), (5, 1), (5, 3)]
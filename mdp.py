@@ -3,40 +3,146 @@ import numpy as np
 import time  # Import time for sleep
 import sys
 import os
-from envs.ui.sprites import load_srpite_map
-
-load_srpite_map()
-
-
-import numpy as np
+import hashlib
+import json
+import shutil
 from enum import Enum
-from envs.constants import Config, Action
-from envs.grid import Grid
-import gymnasium as gym
+from envs.constants import Action, Config, config
+from envs.grid import Grid, ACTION_TO_DIRECTION
 from envs.ui.training_room import TrainingRoom
-from envs.constants import config
+from envs.ui.room import RoomFactory
 
 from envs.grid_world import FireFighterWorld
 
+PRESET_FIRE_POSITIONS = [(5, 0), (5, 1), (5, 3)]
+
+SOLVE_METHODS = ["value_iteration", "policy_iteration", "modified_policy_iteration"]
+
+POLICY_CACHE_DIR = ".mdp_cache"
+POLICY_CACHE_SIZE = 64
+POLICY_CACHE_VERSION = 1  # bump when the model or the stored arrays change
+
+
+class PolicyCache:
+    """
+    On-disk cache of solved policies, one entry per scenario fingerprint.
+
+    Every entry is a directory holding `policy.npy`, `value_function.npy` and
+    `states.npy`. Plain .npy files (rather than one .npz archive) are used
+    because only those can be memory mapped on load. Loading an entry marks
+    it as recently used, the least recently used entries are evicted once
+    there are more than max_entries.
+    """
+
+    ARRAYS = ["policy", "value_function", "states"]
+
+    def __init__(self, directory=POLICY_CACHE_DIR, max_entries=POLICY_CACHE_SIZE):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    @staticmethod
+    def fingerprint(
+        tile_types: np.ndarray, fire_positions: list[tuple], config: Config = config
+    ) -> str:
+        """
+        Hashes everything the optimal policy depends on: the room layout, the
+        fire positions, the reward constants and the discount factor.
+        """
+        scenario = {
+            "version": POLICY_CACHE_VERSION,
+            "shape": tile_types.shape,
+            "fire_positions": sorted([int(x), int(y)] for x, y in fire_positions),
+            "rewards": [
+                config.time_step_punishment,
+                config.distance_reward,
+                config.max_distance,
+                config.illeagal_move_punishment,
+                config.death_punishment,
+                config.evacuation_success_reward,
+                config.fire_extinguished_reward,
+                config.min_reward,
+                config.max_reward,
+            ],
+            "discount_factor": config.discount_factor,
+        }
+        digest = hashlib.sha256(json.dumps(scenario).encode())
+        digest.update(np.ascontiguousarray(tile_types).tobytes())
+
+        return digest.hexdigest()[:32]
+
+    def load(self, key: str) -> dict | None:
+        entry = os.path.join(self.directory, key)
+        try:
+            arrays = {
+                name: np.load(os.path.join(entry, name + ".npy"), mmap_mode="r")
+                for name in self.ARRAYS
+            }
+        except (OSError, ValueError):
+            return None
+
+        os.utime(entry)
+        return arrays
+
+    def save(self, key: str, **arrays: np.ndarray):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = os.path.join(self.directory, key)
+        # write next to the entry first so readers never see a partial one
+        tmp_entry = f"{entry}.{os.getpid()}.tmp"
+
+        os.makedirs(tmp_entry, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(tmp_entry, name + ".npy"), arrays[name])
+
+        try:
+            os.replace(tmp_entry, entry)
+        except OSError:  # another process stored the same entry meanwhile
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self._evict()
+
+    def _evict(self):
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if not name.endswith(".tmp")
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+
+        for entry in entries[self.max_entries :]:
+            shutil.rmtree(entry, ignore_errors=True)
+
 
 class FireEvacuationAgentMDP:
-    def __init__(self, seed=None):
+    def __init__(
+        self,
+        seed=None,
+        preset_fire_positions=PRESET_FIRE_POSITIONS,
+        solve_method="value_iteration",
+        cache_dir=POLICY_CACHE_DIR,
+        config: Config = config,
+        room_factory: RoomFactory = None,
+    ):
         """
         Initializes the FireEvacuationAgentMDP (the MDP solver).
         This class pre-computes the optimal policy for a STATIC fire environment.
+        Solved policies are cached in cache_dir (None disables the cache), so
+        an unchanged scenario is loaded instead of rebuilt and solved.
         """
-        self.np_random = np.random.RandomState(seed)
+        self.config = config
+        self.np_random = np.random.default_rng(seed)
+        self.preset_fire_positions = list(preset_fire_positions)
 
         self.grid_template = Grid(
-            TrainingRoom(),
+            room_factory if room_factory is not None else TrainingRoom(),
             static_mode=True,
             initial_agent_pos=np.array([0, 0]),  # Dummy
             initial_target_pos=np.array([0, 0]),
             np_random=self.np_random,
+            config=self.config,
         )  # Dummy
 
-        self.rows = config.grid_size
-        self.cols = config.grid_size
+        self.rows = self.config.grid_size
+        self.cols = self.config.grid_size
 
         # Define the set of actions the MDP can take
         self.actions = [
@@ -52,22 +158,33 @@ class FireEvacuationAgentMDP:
         self.possible_traversable_positions = []
         for y in range(self.rows):
             for x in range(self.cols):
-                if (
-                    self.grid_template.tiles[x][y]
-                    and self.grid_template.tiles[x][y].is_traversable
-                ):
+                if self.grid_template.traversable[x, y]:
                     self.possible_traversable_positions.append((x, y))
 
         self.states = self._define_states()
+        self.state_array = np.array(self.states, dtype=int).reshape(-1, 4)
         self.num_states = len(self.states)
         self.state_to_idx = {state: i for i, state in enumerate(self.states)}
         self.idx_to_state = {i: state for i, state in enumerate(self.states)}
 
-        # 2. Build Transition Probabilities (P) and Reward Function (R)
-        self.P = self._build_transition_probabilities()  # P[s_idx, a_idx, s_prime_idx]
-        self.R = self._build_reward_function()  # R[s_idx, a_idx]
+        self.fire_mask = np.zeros((self.cols, self.rows), dtype=bool)
+        for pos in self.preset_fire_positions:
+            self.fire_mask[pos[0], pos[1]] = True
+
+        # 2. Look the scenario up in the policy cache
+        self.cache = PolicyCache(cache_dir) if cache_dir is not None else None
+        self.cache_key = PolicyCache.fingerprint(
+            self.grid_template.tile_types, self.preset_fire_positions, self.config
+        )
+        if self._load_cached_policy():
+            print(f"MDP loaded from cache with {self.num_states} states.")
+            return
+
+        # 3. Build the Transition table and Reward Function (R)
+        # next_state[s_idx, a_idx], R[s_idx, a_idx]
+        self.next_state, self.R = self._build_model()
 
-        # 3. Initialize Value Function and Policy
+        # 4. Initialize Value Function and Policy
         self.value_function = np.zeros(self.num_states)
         self.policy = np.zeros(
             self.num_states, dtype=int
@@ -76,10 +193,31 @@ class FireEvacuationAgentMDP:
         print(
             f"MDP Initialized with {self.num_states} states and {len(self.actions)} actions."
         )
-        print("Starting Value Iteration...")
-        # 4. Run Value Iteration to compute the optimal policy
-        self.value_iteration(epsilon=1e-6)
-        print("Value Iteration complete. Optimal policy computed.")
+        print(f"Solving with {solve_method}...")
+        # 5. Run the solver to compute the optimal policy
+        self.solve(method=solve_method, epsilon=1e-6)
+        print("Optimal policy computed.")
+
+        if self.cache is not None:
+            self.cache.save(
+                self.cache_key,
+                policy=self.policy,
+                value_function=self.value_function,
+                states=self.state_array,
+            )
+
+    def _load_cached_policy(self) -> bool:
+        cached = self.cache.load(self.cache_key) if self.cache is not None else None
+        if cached is None or not np.array_equal(
+            cached["states"], self.state_array
+        ):
+            return False
+
+        # the model is only needed to solve again, it is built on demand
+        self.next_state = self.R = None
+        self.policy = cached["policy"]
+        self.value_function = cached["value_function"]
+        return True
 
     def _define_states(self) -> list[tuple]:
         """
@@ -92,148 +230,297 @@ class FireEvacuationAgentMDP:
                 states.append((ax, ay, tx, ty))
         return states
 
-    def _build_transition_probabilities(self) -> np.ndarray:
+    def _build_model(self, state_idx=None) -> tuple[np.ndarray, np.ndarray]:
         """
-        Builds the transition probability matrix P[s_idx, a_idx, s_prime_idx].
-        Since fire is static and moves are deterministic (if legal),
-        P will mostly contain 1.0 for the expected next state and 0.0 otherwise.
+        Builds the transition table next_state[s_idx, a_idx] and the reward
+        function R[s_idx, a_idx] in one pass, for all states or only for the
+        rows in state_idx.
+        Since fire is static and moves are deterministic (if legal), every
+        (state, action) pair leads to exactly one successor, so only its index
+        is stored instead of a dense P[s_idx, a_idx, s_prime_idx] with a single
+        1.0 per row. Memory grows linearly with the number of states.
+
+        Both tables are derived from the traversable and fire masks with the
+        rules of FireFighterWorld.step, no simulator is reset per pair.
         """
-        P = np.zeros((self.num_states, len(self.actions), self.num_states))
-
-        # Temporarily create a FireFighterWorld instance in static mode
-        # to simulate transitions for the MDP.
-        env_simulator = gym.make("FireFighterWorld", render_mode=None, static_mode=True)
-        slip_prob = 0.2
-
-        for s_idx, (ax, ay, tx, ty) in enumerate(self.states):
-            # Reset the simulator environment to the current state (ax, ay, tx, ty)
-            # using the options parameter for initial positions.
-            preset_fire_positions = [(5, 0), (5, 1), (5, 3)]
-
-            observation, info = env_simulator.reset(
-                options={
-                    "initial_agent_pos": np.array([ax, ay]),
-                    "initial_target_pos": np.array([tx, ty]),
-                    "preset_fire_mode": True,
-                    "preset_fire_positions": preset_fire_positions,
-                }
+        states = self.state_array if state_idx is None else self.state_array[state_idx]
+        agent_pos, target_pos = states[:, :2], states[:, 2:]
+
+        # state index = agent position index * positions + target position index
+        position_idx = np.full((self.cols, self.rows), -1, dtype=np.intp)
+        for i, (x, y) in enumerate(self.possible_traversable_positions):
+            position_idx[x, y] = i
+        num_positions = len(self.possible_traversable_positions)
+        target_idx = position_idx[target_pos[:, 0], target_pos[:, 1]]
+
+        next_state = np.zeros((len(states), len(self.actions)), dtype=np.intp)
+        R = np.zeros((len(states), len(self.actions)))
+
+        for a_idx, action in enumerate(self.actions):
+            next_agent_pos, is_legal_move = self._move(
+                agent_pos, ACTION_TO_DIRECTION[action]
             )
+            if action == Action.PUT_OUT_FIRE:
+                is_legal_move &= self._is_next_to_fire(agent_pos)
+
+            next_agent_pos = np.where(is_legal_move[:, None], next_agent_pos, agent_pos)
+            next_state[:, a_idx] = (
+                position_idx[next_agent_pos[:, 0], next_agent_pos[:, 1]]
+                * num_positions
+                + target_idx
+            )
+
+            is_agent_dead = self.fire_mask[next_agent_pos[:, 0], next_agent_pos[:, 1]]
+            is_cat_rescued = np.all(next_agent_pos == target_pos, axis=1)
 
-            current_agent_pos = np.array(
-                observation[0]
-            )  # if you only care about the agent
-            current_target_pos = np.array(observation[1])
-
-            for a_idx, action in enumerate(self.actions):
-                preset_fire_positions = [(5, 0), (5, 1), (5, 3)]
-                observation, info = env_simulator.reset(
-                    options={
-                        "initial_agent_pos": np.array([ax, ay]),
-                        "initial_target_pos": np.array([tx, ty]),
-                        "preset_fire_mode": True,
-                        "preset_fire_positions": preset_fire_positions,
-                    }
-                )
-
-                next_observation, reward, terminated, truncated, next_info = (
-                    env_simulator.step(action.value)
-                )
-                next_agent_pos = next_observation[0]
-                next_target_pos = next_observation[1]
-
-                next_s_tuple = (
-                    next_agent_pos[0],
-                    next_agent_pos[1],
-                    next_target_pos[0],
-                    next_target_pos[1],
-                )
-
-                if next_s_tuple in self.state_to_idx:
-                    next_s_idx = self.state_to_idx[next_s_tuple]
-                    P[s_idx, a_idx, next_s_idx] = 1.0
-                else:
-                    # For safety, make it transition to current state if somehow invalid.
-                    P[s_idx, a_idx, s_idx] = 1.0
-                    print(
-                        f"Warning: Calculated next state {next_s_tuple} not in defined state space."
-                    )
-
-        env_simulator.close()
-        return P
-
-    def _build_reward_function(self) -> np.ndarray:
+            reward = self.config.time_step_punishment + self.config.distance_reward * (
+                self.config.max_distance
+                - np.linalg.norm(next_agent_pos - target_pos, axis=1)
+            )
+            reward += np.select(
+                [~is_legal_move, is_agent_dead, is_cat_rescued],
+                [
+                    self.config.illeagal_move_punishment,
+                    self.config.death_punishment,
+                    self.config.evacuation_success_reward,
+                ],
+                (
+                    self.config.fire_extinguished_reward
+                    if action == Action.PUT_OUT_FIRE
+                    else 0
+                ),
+            )
+            R[:, a_idx] = np.clip(
+                reward, self.config.min_reward, self.config.max_reward
+            )
+
+        return next_state, R
+
+    def update_fire(self, fire_mask: np.ndarray, method="value_iteration", epsilon=1e-6):
         """
-        Builds the reward function R[s_idx, a_idx].
-        Rewards are associated with taking an action from a state.
+        Replans for a new fire layout without starting over.
+        A (state, action) row only depends on the fire on the agent's tile
+        and its neighbours, so only rows whose agent stands on or next to a
+        changed tile are rebuilt. Value Iteration then warm-starts from the
+        previous value function, which is close to the new one when only a
+        few tiles changed.
         """
-        R = np.zeros((self.num_states, len(self.actions)))
-
-        env_simulator = gym.make("FireFighterWorld", render_mode=None, static_mode=True)
+        fire_mask = np.asarray(fire_mask, dtype=bool)
+        changed = fire_mask != self.fire_mask
 
-        for s_idx, (ax, ay, tx, ty) in enumerate(self.states):
-            current_agent_pos = np.array([ax, ay])
-            current_target_pos = np.array([tx, ty])
+        self.fire_mask = fire_mask.copy()
+        self.preset_fire_positions = [tuple(pos) for pos in np.argwhere(fire_mask)]
+        self.cache_key = PolicyCache.fingerprint(
+            self.grid_template.tile_types, self.preset_fire_positions, self.config
+        )
 
-            for a_idx, action in enumerate(self.actions):
-                preset_fire_positions = [(5, 0), (5, 1), (5, 3)]
+        if self.next_state is None:
+            self.next_state, self.R = self._build_model()
+        elif changed.any():
+            affected = changed.copy()
+            affected[1:, :] |= changed[:-1, :]
+            affected[:-1, :] |= changed[1:, :]
+            affected[:, 1:] |= changed[:, :-1]
+            affected[:, :-1] |= changed[:, 1:]
+
+            rows = np.flatnonzero(
+                affected[self.state_array[:, 0], self.state_array[:, 1]]
+            )
+            self.next_state[rows], self.R[rows] = self._build_model(rows)
+        else:
+            return self.policy, self.value_function
 
-                observation, info = env_simulator.reset(
-                    options={
-                        "initial_agent_pos": np.array([ax, ay]),
-                        "initial_target_pos": np.array([tx, ty]),
-                        "preset_fire_mode": True,
-                        "preset_fire_positions": preset_fire_positions,
-                    }
-                )
+        return self.solve(method=method, epsilon=epsilon)
 
-                _, reward, _, _, _ = env_simulator.step(action.value)
-                R[s_idx, a_idx] = reward
+    def _move(self, positions: np.ndarray, direction: np.ndarray):
+        """
+        Moves every position by direction. Returns the clipped new positions
+        and whether each one stays inside the grid on a traversable tile.
+        """
+        moved = positions + direction
+        in_grid = np.all((moved >= 0) & (moved < self.config.grid_size), axis=1)
+        moved = np.clip(moved, 0, self.config.grid_size - 1)
+
+        return moved, in_grid & self.grid_template.traversable[moved[:, 0], moved[:, 1]]
+
+    def _is_next_to_fire(self, positions: np.ndarray) -> np.ndarray:
+        is_next_to_fire = np.zeros(len(positions), dtype=bool)
+        for movement in self.movement_actions:
+            neighbours = positions + ACTION_TO_DIRECTION[movement]
+            in_grid = np.all(
+                (neighbours >= 0) & (neighbours < self.config.grid_size), axis=1
+            )
+            neighbours = np.clip(neighbours, 0, self.config.grid_size - 1)
+            is_next_to_fire |= in_grid & self.fire_mask[neighbours[:, 0], neighbours[:, 1]]
 
-        env_simulator.close()
-        return R
+        return is_next_to_fire
 
-    def value_iteration(self, epsilon=1e-6):
+    def solve(self, method="value_iteration", epsilon=1e-6, k=20):
+        """
+        Computes the optimal policy with one of SOLVE_METHODS. k is the number
+        of evaluation sweeps per improvement step of modified policy iteration.
+        Iterations, wall time and final residual end up in self.solve_report.
+        """
+        if self.next_state is None:
+            self.next_state, self.R = self._build_model()
+
+        match method:
+            case "value_iteration":
+                return self.value_iteration(epsilon=epsilon)
+            case "policy_iteration":
+                return self.policy_iteration()
+            case "modified_policy_iteration":
+                return self.modified_policy_iteration(k=k, epsilon=epsilon)
+            case _:
+                raise Exception(f"Solve method '{method}' not found")
+
+    def value_iteration(self, epsilon=1e-6, max_iterations=10_000):
         """
         Performs Value Iteration to find the optimal value function and policy.
+        Every sweep is a single Bellman backup over all states and actions:
+        Q = R + gamma * V[next_state]. Stops as soon as the largest change in
+        V drops below epsilon, or after max_iterations sweeps.
         """
         V = np.copy(self.value_function)
-        gamma = config.discount_factor  # Get discount factor from config
+        gamma = self.config.discount_factor  # Get discount factor from config
+        start_time = time.perf_counter()
+
+        iteration = 0
+        while True:
+            iteration += 1
+
+            Q = self.R + gamma * V[self.next_state]
+            V_new = Q.max(axis=1)
+            delta = np.max(np.abs(V_new - V), initial=0)
+
+            V = V_new
+            if delta < epsilon or iteration >= max_iterations:
+                break
+            if iteration % 100 == 0:
+                print(f"Value Iteration: {iteration} iterations, Delta: {delta:.6f}")
+
+        self.policy = np.argmax(Q, axis=1)
+        self.value_function = V
+        self._report("value_iteration", iteration, start_time, delta, delta < epsilon)
+
+        return self.policy, self.value_function
+
+    def policy_iteration(self, max_iterations=1_000):
+        """
+        Performs Policy Iteration: evaluates the current policy exactly, then
+        acts greedily on it until the policy no longer changes.
+        """
+        policy = np.copy(self.policy)
+        gamma = self.config.discount_factor
+        start_time = time.perf_counter()
 
         iteration = 0
         while True:
             iteration += 1
-            V_new = np.zeros(self.num_states)
-            delta = 0
 
-            for s_idx in range(self.num_states):
-                q_values = np.zeros(len(self.actions))
-                for a_idx in range(len(self.actions)):
-                    # Calculate expected future reward based on P and V
-                    expected_future_reward = np.sum(self.P[s_idx, a_idx, :] * V)
+            V = self._evaluate_policy(policy)
+            Q = self.R + gamma * V[self.next_state]
+            new_policy = self._improve_policy(Q, policy)
 
-                    q_values[a_idx] = (
-                        self.R[s_idx, a_idx] + gamma * expected_future_reward
-                    )
+            is_stable = np.array_equal(new_policy, policy)
+            policy = new_policy
+            if is_stable or iteration >= max_iterations:
+                break
 
-                if q_values.size > 0:
-                    V_new[s_idx] = np.max(q_values)
-                    self.policy[s_idx] = np.argmax(q_values)
-                else:
-                    V_new[s_idx] = 0
-                    self.policy[s_idx] = 0
+        self.policy = policy
+        self.value_function = V
+        residual = np.max(np.abs(Q.max(axis=1) - V), initial=0)
+        self._report("policy_iteration", iteration, start_time, residual, is_stable)
 
-                delta = max(delta, abs(V_new[s_idx] - V[s_idx]))
+        return self.policy, self.value_function
+
+    def modified_policy_iteration(self, k=20, epsilon=1e-6, max_iterations=10_000):
+        """
+        Performs Modified Policy Iteration: after every greedy improvement the
+        policy is evaluated with k cheap sweeps V = R_pi + gamma * V[next_pi]
+        instead of exactly.
+        """
+        V = np.copy(self.value_function)
+        gamma = self.config.discount_factor
+        state_idx = np.arange(self.num_states)
+        start_time = time.perf_counter()
+
+        iteration = 0
+        while True:
+            iteration += 1
+
+            Q = self.R + gamma * V[self.next_state]
+            policy = np.argmax(Q, axis=1)
+            V_new = Q.max(axis=1)
+            delta = np.max(np.abs(V_new - V), initial=0)
 
             V = V_new
-            if delta < epsilon:
-                print(f"Value Iteration converged in {iteration} iterations.")
+            if delta < epsilon or iteration >= max_iterations:
                 break
-            if iteration % 100 == 0:
-                print(f"Value Iteration: {iteration} iterations, Delta: {delta:.6f}")
 
+            policy_reward = self.R[state_idx, policy]
+            policy_next_state = self.next_state[state_idx, policy]
+            for _ in range(k):
+                V = policy_reward + gamma * V[policy_next_state]
+
+        self.policy = policy
         self.value_function = V
+        self._report(
+            "modified_policy_iteration", iteration, start_time, delta, delta < epsilon
+        )
+
         return self.policy, self.value_function
 
+    def _evaluate_policy(self, policy: np.ndarray, tolerance=1e-12) -> np.ndarray:
+        """
+        Solves V = R_pi + gamma * P_pi V exactly (up to tolerance).
+        P_pi has a single 1.0 per row, so instead of factorizing a matrix the
+        discounted rewards are summed along each state's successor chain,
+        doubling the covered horizon every step by squaring the successor map.
+        """
+        gamma = self.config.discount_factor
+        if gamma >= 1:
+            raise Exception("Policy evaluation needs a discount factor below 1")
+
+        state_idx = np.arange(self.num_states)
+        V = self.R[state_idx, policy].astype(float)
+        successor = self.next_state[state_idx, policy]
+        max_reward = np.max(np.abs(V), initial=0)
+
+        # V holds the discounted reward of the first `horizon` steps,
+        # discount is gamma ** horizon
+        discount = gamma
+        while discount * max_reward / (1 - gamma) > tolerance:
+            V = V + discount * V[successor]
+            successor = successor[successor]
+            discount *= discount
+
+        return V
+
+    def _improve_policy(self, Q: np.ndarray, policy: np.ndarray) -> np.ndarray:
+        """
+        Greedy policy on Q that keeps the current action on ties, so policy
+        iteration cannot cycle between equally good policies.
+        """
+        state_idx = np.arange(self.num_states)
+        best = np.argmax(Q, axis=1)
+        keep = Q[state_idx, policy] >= Q[state_idx, best] - 1e-12
+
+        return np.where(keep, policy, best)
+
+    def _report(self, method, iterations, start_time, residual, is_converged):
+        self.solve_report = {
+            "method": method,
+            "iterations": iterations,
+            "wall_time": time.perf_counter() - start_time,
+            "residual": residual,
+        }
+        print(
+            f"{method} {'converged' if is_converged else 'stopped'} in "
+            f"{iterations} iterations, {self.solve_report['wall_time'] * 1000:.2f} ms, "
+            f"residual {residual:.2e}."
+        )
+
     def get_optimal_action(
         self, current_agent_pos: np.ndarray, current_target_pos: np.ndarray
     ) -> Action:
@@ -254,12 +541,12 @@ class FireEvacuationAgentMDP:
             )
             return Action.UP
 
-        if np.random.uniform(0, 1) < 0.8:
+        if self.np_random.random() < 0.8:
             s_idx = self.state_to_idx[current_state_tuple]
             optimal_action_idx = self.policy[s_idx]
             return self.actions[optimal_action_idx]
         else:
-            return np.random.choice(self.actions)
+            return self.actions[self.np_random.integers(len(self.actions))]
 
     def get_value_function(self):
         return self.value_function
@@ -281,23 +568,29 @@ gym.envs.registration.register(
 
 
 # Static environment vars
-config.chance_of_catching_fire = 0
-config.chance_of_self_extinguish = 0
-
-config.static_fire_mode = True
+mdp_config = config.replace(
+    chance_of_catching_fire=0,
+    chance_of_self_extinguish=0,
+    static_fire_mode=True,
+)
 
-print(f"Running in static fire mode: {config.static_fire_mode}")
-print(f"Grid size: {config.grid_size}")
-print(f"Reward for success: {config.evacuation_success_reward}")
-print(f"Discount factor: {config.discount_factor}")
+print(f"Running in static fire mode: {mdp_config.static_fire_mode}")
+print(f"Grid size: {mdp_config.grid_size}")
+print(f"Reward for success: {mdp_config.evacuation_success_reward}")
+print(f"Discount factor: {mdp_config.discount_factor}")
 
 
 def run_mdp_simulation():
     print("Initializing MDP Solver...")
-    mdp_solver = FireEvacuationAgentMDP(seed=42)
+    mdp_solver = FireEvacuationAgentMDP(seed=42, config=mdp_config)
 
     print("Creating environment for visualization...")
-    env = gym.make("FireFighterWorld-v0", render_mode="human", static_mode=True)
+    env = gym.make(
+        "FireFighterWorld-v0",
+        render_mode="human",
+        static_mode=True,
+        config=mdp_config,
+    )
 
     initial_agent_pos = np.array([0, 5])
     initial_target_pos = np.array([0, 0])
@@ -306,11 +599,7 @@ def run_mdp_simulation():
         f"Resetting environment to initial state: Agent at {initial_agent_pos}, Target at {initial_target_pos}"
     )
 
-    preset_fire_positions = [
-        (5, 0),
-        (5, 1),
-        (5, 3),
-    ]  # Example: fire at (3,2) as you want
+    preset_fire_positions = PRESET_FIRE_POSITIONS
 
     observation, info = env.reset(
         options={
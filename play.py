@@ -5,24 +5,27 @@ import pygame
 import numpy as np
 from envs.constants import Action, config
 from envs.ui.window import Window
+from envs.ui.renderer import GridRenderer
 from envs.grid import Grid
 from envs.ui.sprites import load_srpite_map
 from envs.ui.play_room import PlayRoom
 import sys
 import asyncio
 
-config.grid_size = 8
-config.window_size = 512
-config.square_size = int(config.window_size / config.grid_size)
-config.fps = 60
-config.animation_delay = 60 / 8
-config.static_fire_mode = False
-config.chance_of_catching_fire = 0.03
-config.chance_of_self_extinguish = config.chance_of_catching_fire / 15
+config = config.replace(
+    grid_size=8,
+    window_size=512,
+    fps=60,
+    animation_delay=60 / 8,
+    static_fire_mode=False,
+    chance_of_catching_fire=0.03,
+    chance_of_self_extinguish=0.03 / 15,
+)
 
-load_srpite_map()
-window = Window()
-grid = Grid(PlayRoom())
+load_srpite_map(config)
+window = Window(config)
+grid = Grid(PlayRoom(), config=config)
+renderer = GridRenderer()
 
 
 async def play():
@@ -70,7 +73,9 @@ async def play():
         grid.update(action)
 
         if grid.is_cat_rescued():
-            window.draw(lambda canvas: grid.draw(canvas), lambda: grid.animate())
+            window.draw(
+                lambda canvas: renderer.draw(grid, canvas), lambda: grid.animate()
+            )
             running = await window.win_screen()
             if running:
                 grid.create_grid()
@@ -78,14 +83,19 @@ async def play():
         if grid.is_agent_dead():
             while grid.is_animation_on_going:
                 await asyncio.sleep(0)
-                window.draw(lambda canvas: grid.draw(canvas), lambda: grid.animate())
+                window.draw(
+                    lambda canvas: renderer.draw(grid, canvas),
+                    lambda: grid.animate(),
+                )
 
             running = await window.game_over_screen()
 
             if running:
                 grid.create_grid()
         else:
-            window.draw(lambda canvas: grid.draw(canvas), lambda: grid.animate())
+            window.draw(
+                lambda canvas: renderer.draw(grid, canvas), lambda: grid.animate()
+            )
 
     window.close()
 
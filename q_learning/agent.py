@@ -1,8 +1,9 @@
-from envs.utilities import decide_random_action
+from envs.utilities import decide_random_action, ObservationEncoder
 import os
 import numpy as np
-from envs.constants import Action, Observation, config
-from q_learning.debug import Visualizer
+from q_learning.checkpoint import QTableFile, training_table
+from q_learning.storage import QTableStorage, fixed_point_scale
+from envs.constants import Action, Observation, Config, config
 
 from q_learning.constants import (
     DISCOUNT_FACTOR,
@@ -12,50 +13,128 @@ from q_learning.constants import (
     FINAL_EPSILON,
     INITIAL_EPSILON,
     FILE_NAME,
+    Q_TABLE_DTYPE,
     DEBUG,
 )
 
 
-visualizer = Visualizer(
-    grid_shape=(config.grid_size, config.grid_size), num_actions=len(Action)
-)
-
-
-def get_values(q_table, observation):
-    return q_table[observation[1][0]][observation[1][1]][1 if observation[2] else 0][
-        observation[0][0]
-    ][observation[0][1]]
+visualizer = None  # shared by the debugged agents, opened by the first one
 
 
 class Agent:
     epsilon = INITIAL_EPSILON
 
-    def __init__(self, seed=None):
-        if not SAVE_Q_TABLE and os.path.exists(FILE_NAME):
+    def __init__(
+        self,
+        seed=None,
+        q_table: np.ndarray = None,
+        learning_rate=LEARNING_RATE,
+        discount_factor=DISCOUNT_FACTOR,
+        initial_epsilon=INITIAL_EPSILON,
+        final_epsilon=FINAL_EPSILON,
+        epsilon_decay=EPSILON_DECAY,
+        debug=DEBUG,
+        config: Config = config,
+        np_random: np.random.Generator = None,
+        q_table_file=FILE_NAME,
+        q_table_dtype=Q_TABLE_DTYPE,
+    ):
+        self.config = config
+        self.storage = None
+        # usually the exploration stream of the env the agent is trained on
+        self.np_random = (
+            np_random if np_random is not None else np.random.default_rng(seed)
+        )
+        self.encoder = ObservationEncoder(config.grid_size)
+
+        # the module constants are the defaults, a sweep overrides them per run
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.epsilon = initial_epsilon
+        self.final_epsilon = final_epsilon
+        self.epsilon_decay = epsilon_decay
+        self.debug = debug
+
+        global visualizer
+        if debug and visualizer is None:
+            # the visualizer pulls in pygame and matplotlib
+            from q_learning.debug import Visualizer
+
+            visualizer = Visualizer(
+                grid_shape=(config.grid_size, config.grid_size),
+                num_actions=len(Action),
+            )
+
+        # (target_x, target_y, is_fire_present, agent_x, agent_y), action = 12960
+        shape = (self.encoder.num_states, len(Action))
+
+        self.q_table_file = None
+        scale = None
+        if q_table is not None:
+            # e.g. a view on shared memory owned by a parallel trainer
+            self.q_table = q_table
+        elif q_table_file is not None and SAVE_Q_TABLE:
+            # trained in place, the file is the checkpoint
+            self.q_table_file = training_table(
+                q_table_file,
+                shape,
+                q_table_dtype,
+                fixed_point_scale(q_table_dtype, config),
+            )
+            self.q_table = self.q_table_file.table
+            scale = self.q_table_file.scale
+        elif q_table_file is not None and os.path.exists(q_table_file):
             print("Loading Q-table from file...")
-            self.q_table = np.load(FILE_NAME)
+            # copy on write, updates never reach the file
+            loaded = QTableFile(q_table_file, mode="c")
+            self.q_table = loaded.table
+            scale = loaded.scale
         else:
-            self.q_table = np.zeros(
-                [
-                    config.grid_size,
-                    config.grid_size,
-                    2,
-                    config.grid_size,
-                    config.grid_size,
-                    len(Action),
-                ]
-            )
-            # target_x, target_y, is_fire_present, agent_x, agent_y, action = 12960
+            self.q_table = np.zeros(shape, dtype=q_table_dtype)
+
+        # a given or loaded table keeps its own dtype and scale
+        self.storage = QTableStorage(
+            self.q_table.dtype, config, self.np_random.spawn(1)[0], scale
+        )
+
+    @property
+    def np_random(self) -> np.random.Generator:
+        return self._np_random
+
+    @np_random.setter
+    def np_random(self, np_random: np.random.Generator):
+        # rounding draws from a stream of its own so it does not shift the
+        # exploration, and follows the generator the agent is given later
+        self._np_random = np_random
+        if self.storage is not None:
+            self.storage.np_random = np_random.spawn(1)[0]
+
+    def get_state(self, observation: Observation | int) -> int:
+        """
+        Flat q-table row of an observation, environments created with
+        observation_mode="discrete" already emit it.
+        """
+        if isinstance(observation, (int, np.integer)):
+            return observation
+
+        return self.encoder.encode(observation)
+
+    def get_states(self, observations) -> np.ndarray:
+        """Batched get_state for FireFighterWorldBatch observations."""
+        if isinstance(observations, tuple):
+            return self.encoder.encode_batch(observations)
+
+        return np.asarray(observations)
 
     def get_action(self, actions: list[Action], observation: Observation) -> int:
         """
         Returns the best action with probability (1 - epsilon)
         otherwise a random action with probability epsilon to ensure exploration.
         """
-        if np.random.uniform(0, 1) < self.epsilon:
-            return actions.sample()
+        if self.np_random.random() < self.epsilon:
+            return int(self.np_random.integers(actions.n))
         else:
-            return np.argmax(get_values(self.q_table, observation))
+            return np.argmax(self.q_table[self.get_state(observation)])
 
     def update(
         self,
@@ -65,24 +144,99 @@ class Agent:
         terminated: bool,
         next_obs: Observation,
     ):
-        q_value = get_values(self.q_table, obs)[action]
-        future_q_value = np.max(get_values(self.q_table, next_obs))
+        state = self.get_state(obs)
+        q_value = self.storage.decode(self.q_table[state, action])
+        future_q_value = self.storage.decode(
+            self.q_table[self.get_state(next_obs)].max()
+        )
 
-        temporal_difference = reward + DISCOUNT_FACTOR * future_q_value - q_value
+        temporal_difference = reward + self.discount_factor * future_q_value - q_value
 
-        get_values(self.q_table, obs)[action] = max(
-            min(q_value + LEARNING_RATE * temporal_difference, config.max_reward),
-            config.min_reward,
+        self.q_table[state, action] = self.storage.encode(
+            max(
+                min(
+                    q_value + self.learning_rate * temporal_difference,
+                    self.config.max_reward,
+                ),
+                self.config.min_reward,
+            )
         )
 
-        if DEBUG:
+        if self.debug:
+            _, target, is_fire_present = (
+                self.encoder.decode(state) if obs is state else obs
+            )
             visualizer.update(
-                self.q_table, self.epsilon, temporal_difference, obs[1], obs[2]
+                self.storage.decode(self.q_table),
+                self.epsilon,
+                temporal_difference,
+                target,
+                is_fire_present,
             )
 
+    def get_actions(self, observations) -> np.ndarray:
+        """Batched get_action, one epsilon-greedy action per observation."""
+        states = self.get_states(observations)
+        actions = np.argmax(self.q_table[states], axis=1)
+
+        explore = self.np_random.random(len(states)) < self.epsilon
+        actions[explore] = self.np_random.integers(len(Action), size=explore.sum())
+
+        return actions
+
+    def update_batch(
+        self,
+        obs,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        terminated: np.ndarray,
+        next_obs,
+    ) -> np.ndarray:
+        """
+        Applies the TD updates of a whole batch of transitions at once and
+        returns their temporal differences. All of them are computed against
+        the q-table as it was before the batch; when several transitions hit
+        the same (state, action) pair their temporal differences are averaged,
+        so the result does not depend on the order of the batch.
+        Like `update`, the future value is bootstrapped on terminal steps too.
+        """
+        states = self.get_states(obs)
+        actions = np.asarray(actions)
+
+        q_values = self.storage.decode(self.q_table[states, actions])
+        future_q_values = self.storage.decode(
+            self.q_table[self.get_states(next_obs)].max(axis=1)
+        )
+        temporal_differences = (
+            rewards + self.discount_factor * future_q_values - q_values
+        )
+
+        pairs, pair_idx, pair_counts = np.unique(
+            states * len(Action) + actions, return_inverse=True, return_counts=True
+        )
+        mean_temporal_differences = (
+            np.bincount(pair_idx, weights=temporal_differences, minlength=len(pairs))
+            / pair_counts
+        )
+
+        q_table = self.q_table.reshape(-1)
+        q_table[pairs] = self.storage.encode(
+            np.clip(
+                self.storage.decode(q_table[pairs])
+                + self.learning_rate * mean_temporal_differences,
+                self.config.min_reward,
+                self.config.max_reward,
+            )
+        )
+
+        return temporal_differences
+
     def decay_epsilon(self):
-        self.epsilon = max(FINAL_EPSILON, self.epsilon - EPSILON_DECAY)
+        self.epsilon = max(self.final_epsilon, self.epsilon - self.epsilon_decay)
 
     def save(self):
-        if SAVE_Q_TABLE:
-            np.save(FILE_NAME, self.q_table)
+        """
+        Writes the q-table file to disk, it is flushed periodically anyway.
+        """
+        if self.q_table_file is not None:
+            self.q_table_file.flush()
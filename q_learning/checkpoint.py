@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import numpy as np
+from envs.constants import Action
+from q_learning.constants import FILE_NAME, FLUSH_INTERVAL
+
+
+class QTableFile:
+    """
+    A q-table living in a memory-mapped .npy file instead of in RAM.
+
+    Writes to `table` go straight to the page cache, so they outlive a crash
+    of the training process, and a daemon thread flushes them to disk every
+    `flush_interval` seconds to also outlive a crash of the machine. The
+    flush releases the GIL, training keeps running meanwhile.
+
+    Other processes can map the same file read-only (`mode="r"`) and see
+    the table as it is being trained, in the dtype stored in the file. A new
+    table (`mode="w+"`) is created next to `path` and only renamed over it
+    at its first flush, until then a previous table stays in place, and a
+    process still mapping that one keeps reading it.
+
+    The fixed-point `scale` of an int16 table is kept in a JSON file next
+    to the table, so it is loaded with the values it was trained with.
+    """
+
+    def __init__(
+        self,
+        path=FILE_NAME,
+        shape=None,
+        mode="r",
+        flush_interval=FLUSH_INTERVAL,
+        dtype=np.float64,
+        scale=None,
+    ):
+        self.path = path
+        self.metadata_path = f"{os.path.splitext(path)[0]}.json"
+        # files renamed into place at the first flush
+        self._pending = []
+        self._lock = threading.Lock()
+
+        if mode == "w+":
+            self.scale = scale
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            self._memmap = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=dtype, shape=shape
+            )
+
+            tmp_metadata_path = f"{self.metadata_path}.{os.getpid()}.tmp"
+            with open(tmp_metadata_path, "w") as file:
+                json.dump({"scale": scale}, file)
+            # the table last, a reader never finds it with a stale scale
+            self._pending = [
+                (tmp_metadata_path, self.metadata_path),
+                (tmp_path, path),
+            ]
+        else:
+            self._memmap = np.load(path, mmap_mode=mode)
+            self.scale = None
+            if os.path.exists(self.metadata_path):
+                with open(self.metadata_path) as file:
+                    self.scale = json.load(file)["scale"]
+
+        # older tables were saved 6-D, the flat layout is the same memory
+        self.table = self._memmap.reshape(-1, len(Action))
+
+        self._closing = threading.Event()
+        self._flusher = None
+        if mode in ("w+", "r+") and flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, args=(flush_interval,), daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_periodically(self, interval):
+        while not self._closing.wait(interval):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._memmap.flush()
+            for tmp_path, path in self._pending:
+                os.replace(tmp_path, path)
+            self._pending = []
+
+    def close(self):
+        self._closing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self.flush()
+
+
+def training_table(path, shape, dtype=np.float64, scale=None) -> QTableFile:
+    """
+    The q-table file to train in: an existing table at `path` is resumed,
+    e.g. the one that survived a crash, with its own dtype and scale,
+    otherwise a new one is created.
+    """
+    if not os.path.exists(path):
+        return QTableFile(path, shape, mode="w+", dtype=dtype, scale=scale)
+
+    print("Resuming training from the Q-table file...")
+    table_file = QTableFile(path, mode="r+")
+    if table_file.table.shape != tuple(shape):
+        raise Exception(
+            f"Q-table file {path} has shape {table_file.table.shape}, "
+            f"expected {tuple(shape)}"
+        )
+
+    return table_file
@@ -17,3 +17,14 @@ EPSILON_DECAY = (INITIAL_EPSILON - FINAL_EPSILON) / (N_EPISODES * 0.8)
 DISCOUNT_FACTOR = 0.95
 
 FILE_NAME = "q_table.npy"
+Q_TABLE_DTYPE = "float64"  # or float32, float16, int16 (fixed-point)
+FLUSH_INTERVAL = 60  # seconds between q-table flushes to disk while training
+
+# parallel training
+N_WORKERS = 8
+EPISODES_PER_SYNC = 100
+CHECKPOINT_EVERY = 10  # in syncs
+SYNC_TIMEOUT = 600  # seconds, a sync taking longer means a worker is stuck
+
+# hyperparameter sweeps
+SWEEP_RESULTS_FILE = "sweep_results.jsonl"
@@ -6,6 +6,7 @@ import pygame
 from envs.constants import config
 import time
 from q_learning.constants import DEBUG_UPDATE
+from envs.utilities import ObservationEncoder
 
 UP = "↑"
 DOWN = "↓"
@@ -99,6 +100,7 @@ class Axis:
 class QValuePlot:
 
     def __init__(self, axis):
+        self.encoder = ObservationEncoder()
         self.texts = {}
         self.ax = axis
         self.ax.set_xlim(0, config.grid_size)
@@ -142,7 +144,7 @@ class QValuePlot:
     def update(self, q_table, target, is_fire_on):
         for x in range(config.grid_size):
             for y in range(config.grid_size):
-                values = get_values(q_table, (((x, y), target, is_fire_on)))
+                values = q_table[self.encoder.encode(((x, y), target, is_fire_on))]
 
                 max = {"val": 0, "action": ""}
                 for direction, value in zip(
@@ -161,8 +163,3 @@ class QValuePlot:
                 text_obj.set_text(f"{max['action']}")
                 text_obj.set_color(color)
 
-
-def get_values(q_table, observation):
-    return q_table[observation[1][0]][observation[1][1]][1 if observation[2] else 0][
-        observation[0][0]
-    ][observation[0][1]]
@@ -175,7 +175,9 @@ def calculate_stuck_positions(q_table, observation):
         3: (1, 0),  # RIGHT
         4: (0, 0),  # PUT OUT FIRE
     }
-    states = q_table[observation[1][0]][observation[1][1]][1 if observation[2] else 0]
+    states = q_table.reshape(
+        config.grid_size, config.grid_size, 2, config.grid_size, config.grid_size, -1
+    )[observation[1][0], observation[1][1], 1 if observation[2] else 0]
 
     positions = 0
     for x in range(config.grid_size):
@@ -0,0 +1,320 @@
+import math
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from envs.constants import Action
+from envs.utilities import ObservationEncoder
+from q_learning.checkpoint import training_table
+from q_learning.storage import QTableStorage, fixed_point_scale
+from q_learning.constants import (
+    N_EPISODES,
+    N_WORKERS,
+    EPISODES_PER_SYNC,
+    CHECKPOINT_EVERY,
+    SYNC_TIMEOUT,
+    MAX_STEPS_PER_EPISODE,
+    LEARNING_RATE,
+    FINAL_EPSILON,
+    SAVE_Q_TABLE,
+    FILE_NAME,
+    Q_TABLE_DTYPE,
+)
+
+PRESET_FIRE_POSITIONS = [(5, 0), (5, 1), (5, 3)]
+
+
+class SharedArray:
+    """A NumPy array living in a `multiprocessing.shared_memory` block."""
+
+    def __init__(self, shape, name=None):
+        size = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        self.shape = shape
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=name is None, size=size
+        )
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=self.memory.buf)
+
+    def close(self, unlink=False):
+        del self.array
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def epsilon_floors(workers: int) -> np.ndarray:
+    """
+    Every worker explores with its own schedule: all decay linearly from
+    the initial epsilon, but worker i settles at FINAL_EPSILON ** (1 + i / (K - 1)),
+    so some workers keep exploring while others exploit.
+    """
+    return FINAL_EPSILON ** (1 + np.arange(workers) / max(1, workers - 1))
+
+
+def _worker(*args):
+    barrier = args[-2]  # see the arguments of _explore
+    try:
+        _explore(*args)
+    except threading.BrokenBarrierError:
+        pass  # the coordinator or another worker gave up
+    except BaseException:
+        # wakes up everyone waiting for this worker
+        barrier.abort()
+        raise
+
+
+def _explore(
+    worker_id,
+    seed,
+    table_names,
+    q_table_shape,
+    episodes_per_sync,
+    preset_fire_positions,
+    learning_rate,
+    sync_timeout,
+    barrier,
+    stop,
+):
+    from envs.grid_world import FireFighterWorld
+    from q_learning.agent import Agent
+
+    global_table = SharedArray(q_table_shape, table_names["global"])
+    workers = barrier.parties - 1
+    worker_tables = SharedArray((workers, *q_table_shape), table_names["workers"])
+    epsilons = SharedArray((workers,), table_names["epsilons"])
+    rewards = SharedArray((workers,), table_names["rewards"])
+
+    env = FireFighterWorld(static_mode=True, observation_mode="discrete")
+    options = {"preset_fire_positions": preset_fire_positions}
+    observation, _ = env.reset(seed=seed, options=options)
+
+    q_table = worker_tables.array[worker_id]
+    agent = Agent(
+        q_table=q_table,
+        learning_rate=learning_rate,
+        debug=False,
+        np_random=env.random_streams["exploration"],
+    )
+
+    while True:
+        barrier.wait(sync_timeout)  # sync start
+        if stop.is_set():
+            break
+
+        q_table[:] = global_table.array
+        agent.epsilon = epsilons.array[worker_id]
+        total_reward = 0
+
+        for _ in range(episodes_per_sync):
+            for _ in range(MAX_STEPS_PER_EPISODE):
+                action = agent.get_action(env.action_space, observation)
+                next_observation, reward, terminated, _, _ = env.step(action)
+                agent.update(observation, action, reward, terminated, next_observation)
+                observation = next_observation
+                total_reward += reward
+
+                if terminated:
+                    break
+
+            observation, _ = env.reset(options=options)
+
+        rewards.array[worker_id] = total_reward / episodes_per_sync
+        barrier.wait(sync_timeout)  # sync end
+
+    env.close()
+    for shared in (global_table, worker_tables, epsilons, rewards):
+        shared.close()
+
+
+class ParallelTrainer:
+    """
+    Trains one Q-table with `workers` processes.
+
+    Every worker runs its own seeded FireFighterWorld and explores on a copy
+    of the global table for `episodes_per_sync` episodes, then the coordinator
+    merges all copies back into the global table, decays each worker's
+    epsilon and checkpoints. All tables live in shared memory, so syncing
+    costs no pickling or copying between processes. A checkpoint copies the
+    global table into the memory-mapped q-table file, which is flushed to
+    disk in the background. The shared tables stay float64 so merging has
+    the precision of the averages, only the file is stored in Q_TABLE_DTYPE.
+    """
+
+    def __init__(
+        self,
+        workers=N_WORKERS,
+        n_episodes=N_EPISODES,
+        episodes_per_sync=EPISODES_PER_SYNC,
+        checkpoint_every=CHECKPOINT_EVERY,
+        preset_fire_positions=PRESET_FIRE_POSITIONS,
+        seed=42,
+        # like a sweep, not the evaluation defaults of the module constants
+        learning_rate=LEARNING_RATE or 0.1,
+        initial_epsilon=1.0,
+        sync_timeout=SYNC_TIMEOUT,
+    ):
+        if learning_rate <= 0:
+            raise Exception(f"Learning rate {learning_rate} would not learn")
+
+        self.workers = workers
+        self.episodes_per_sync = episodes_per_sync
+        self.checkpoint_every = checkpoint_every
+        self.preset_fire_positions = preset_fire_positions
+        self.seed = seed
+        self.learning_rate = learning_rate
+        self.initial_epsilon = initial_epsilon
+        self.sync_timeout = sync_timeout
+
+        worker_episodes = math.ceil(n_episodes / workers)
+        self.syncs = math.ceil(worker_episodes / episodes_per_sync)
+
+        self.final_epsilons = epsilon_floors(workers)
+        if initial_epsilon < self.final_epsilons.max():
+            raise Exception(
+                f"Initial epsilon {initial_epsilon} is below the final epsilons "
+                f"{self.final_epsilons.max():.3f}, epsilon would grow"
+            )
+        self.epsilon_decays = (initial_epsilon - self.final_epsilons) / (
+            worker_episodes * 0.8
+        )
+
+        self.q_table_shape = (ObservationEncoder().num_states, len(Action))
+        self.q_table_file = None
+        self.storage = QTableStorage(
+            Q_TABLE_DTYPE, np_random=np.random.default_rng(seed)
+        )
+
+    def run(self) -> np.ndarray:
+        context = mp.get_context("spawn")
+        barrier = context.Barrier(self.workers + 1)
+        stop = context.Event()
+
+        global_table = SharedArray(self.q_table_shape)
+        worker_tables = SharedArray((self.workers, *self.q_table_shape))
+        epsilons = SharedArray((self.workers,))
+        rewards = SharedArray((self.workers,))
+        table_names = {
+            "global": global_table.memory.name,
+            "workers": worker_tables.memory.name,
+            "epsilons": epsilons.memory.name,
+            "rewards": rewards.memory.name,
+        }
+
+        global_table.array[:] = 0
+        epsilons.array[:] = self.initial_epsilon
+
+        if SAVE_Q_TABLE:
+            self.q_table_file = training_table(
+                FILE_NAME,
+                self.q_table_shape,
+                Q_TABLE_DTYPE,
+                fixed_point_scale(Q_TABLE_DTYPE),
+            )
+            # a resumed table keeps its dtype and scale
+            self.storage = QTableStorage(
+                self.q_table_file.table.dtype,
+                np_random=self.storage.np_random,
+                scale=self.q_table_file.scale,
+            )
+            global_table.array[:] = self.storage.decode(self.q_table_file.table)
+
+        processes = [
+            context.Process(
+                target=_worker,
+                args=(
+                    worker_id,
+                    self.seed + worker_id,
+                    table_names,
+                    self.q_table_shape,
+                    self.episodes_per_sync,
+                    self.preset_fire_positions,
+                    self.learning_rate,
+                    self.sync_timeout,
+                    barrier,
+                    stop,
+                ),
+            )
+            for worker_id in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        try:
+            for sync in range(1, self.syncs + 1):
+                barrier.wait(self.sync_timeout)  # workers start exploring
+                barrier.wait(self.sync_timeout)  # workers are done
+
+                self.merge(global_table.array, worker_tables.array)
+                self.decay_epsilon(epsilons.array)
+
+                print(
+                    f"Sync {sync}/{self.syncs}: "
+                    f"mean reward {rewards.array.mean():.2f}, "
+                    f"epsilon {epsilons.array.min():.3f}-{epsilons.array.max():.3f}"
+                )
+
+                if sync % self.checkpoint_every == 0:
+                    self.save(global_table.array)
+
+            stop.set()
+            barrier.wait(self.sync_timeout)
+        except KeyboardInterrupt:
+            print("Training interrupted")
+            barrier.abort()
+            for process in processes:
+                process.terminate()
+        except threading.BrokenBarrierError:
+            # a worker failed, or did not finish the sync in time
+            for process in processes:
+                process.join(timeout=1)
+            failed = {
+                worker_id: process.exitcode
+                for worker_id, process in enumerate(processes)
+                if not process.is_alive() and process.exitcode != 0
+            }
+            print(
+                f"Sync failed, exit codes of failed workers: {failed or 'timeout'}, "
+                "saving the table of the last completed sync"
+            )
+            barrier.abort()
+            for process in processes:
+                process.terminate()
+
+        for process in processes:
+            process.join()
+
+        q_table = global_table.array.copy()
+        self.save(q_table)
+        if self.q_table_file is not None:
+            self.q_table_file.close()
+
+        for shared in (worker_tables, epsilons, rewards):
+            shared.close(unlink=True)
+        global_table.close(unlink=True)
+
+        return q_table
+
+    @staticmethod
+    def merge(global_table: np.ndarray, worker_tables: np.ndarray):
+        """
+        Adds the workers' changes to the global table. Entries changed by
+        several workers get the average of their changes, entries changed by
+        a single worker keep that worker's update undiluted.
+        """
+        changes = worker_tables - global_table
+        changed_by = np.count_nonzero(changes, axis=0)
+        global_table += changes.sum(axis=0) / np.maximum(changed_by, 1)
+
+    def decay_epsilon(self, epsilons: np.ndarray):
+        epsilons[:] = np.maximum(
+            self.final_epsilons,
+            epsilons - self.epsilon_decays * self.episodes_per_sync,
+        )
+
+    def save(self, q_table: np.ndarray):
+        if self.q_table_file is not None:
+            self.q_table_file.table[:] = self.storage.encode(q_table)
+
+
+if __name__ == "__main__":
+    ParallelTrainer().run()
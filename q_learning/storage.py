@@ -0,0 +1,86 @@
+import numpy as np
+from envs.constants import Config, config
+
+DTYPES = ["float64", "float32", "float16", "int16"]
+
+
+def fixed_point_scale(dtype, config: Config = config) -> float | None:
+    """
+    The scale that fits the reward range into an integer dtype, None for a
+    float dtype.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind != "i":
+        return None
+
+    bound = max(abs(config.min_reward), abs(config.max_reward))
+    return np.iinfo(dtype).max / bound
+
+
+class QTableStorage:
+    """
+    How the q-values are stored in a q-table of `dtype`.
+
+    An int16 table stores fixed-point values, the value times `scale`. The
+    scale of a saved table is passed in, a new one fits the reward range
+    into the int16 range, a q-value of [-100, 100] then has a resolution of
+    about 0.003.
+
+    Storing in anything but float64 rounds stochastically, up or down with
+    the probability given by the distance to the two neighbouring values.
+    The rounding is unbiased, so updates smaller than the resolution still
+    move the q-values on average instead of being rounded away. Decoding
+    keeps the order of the values, so an argmax works on the stored table.
+    """
+
+    def __init__(
+        self,
+        dtype="float64",
+        config: Config = config,
+        np_random: np.random.Generator = None,
+        scale=None,
+    ):
+        self.dtype = np.dtype(dtype)
+        if self.dtype.name not in DTYPES:
+            raise Exception(f"Q-table dtype {self.dtype} not supported, use {DTYPES}")
+
+        self.np_random = (
+            np_random if np_random is not None else np.random.default_rng()
+        )
+        self.exact = self.dtype == np.float64
+        self.scale = None
+        if self.dtype.kind == "i":
+            self.limit = np.iinfo(self.dtype).max
+            self.scale = (
+                scale if scale is not None else fixed_point_scale(self.dtype, config)
+            )
+
+    def decode(self, stored):
+        if self.exact:
+            return stored
+        if self.scale is not None:
+            return stored / self.scale
+
+        return np.asarray(stored, dtype=np.float64)
+
+    def encode(self, values):
+        if self.exact:
+            return values
+
+        values = np.asarray(values, dtype=np.float64)
+        if self.scale is not None:
+            scaled = values * self.scale
+            lower = np.floor(scaled)
+            rounded = lower + (self.np_random.random(values.shape) < scaled - lower)
+            return np.clip(rounded, -self.limit, self.limit).astype(self.dtype)
+
+        nearest = values.astype(self.dtype)
+        # the representable value on the other side of `values`
+        other = np.nextafter(
+            nearest, np.where(nearest < values, np.inf, -np.inf).astype(self.dtype)
+        )
+        gap = other.astype(np.float64) - nearest
+        chance = np.divide(
+            values - nearest, gap, out=np.zeros_like(values), where=gap != 0
+        )
+        return np.where(self.np_random.random(values.shape) < chance, other, nearest)
@@ -0,0 +1,230 @@
+import itertools
+import json
+import os
+import time
+import multiprocessing as mp
+from enum import Enum
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from q_learning.constants import (
+    N_EPISODES,
+    MAX_STEPS_PER_EPISODE,
+    LEARNING_RATE,
+    DISCOUNT_FACTOR,
+    FINAL_EPSILON,
+    Q_TABLE_DTYPE,
+    SWEEP_RESULTS_FILE,
+)
+from q_learning.parallel import PRESET_FIRE_POSITIONS
+
+# the sweeps so far were done by hand, see the file name in Metrics.save
+PARAMETER_GRID = {
+    "distance_reward": [0.1, 0.2],
+    "time_step_punishment": [-1, -2],
+    "illeagal_move_punishment": [-5, -10],
+    "learning_rate": [0.1],
+    "discount_factor": [0.95],
+}
+
+# every other swept parameter is an attribute of envs.constants.Config
+AGENT_PARAMETERS = {
+    "learning_rate": LEARNING_RATE or 0.1,
+    "discount_factor": DISCOUNT_FACTOR,
+    "initial_epsilon": 1.0,
+    "final_epsilon": FINAL_EPSILON,
+    "epsilon_decay": None,  # derived from n_episodes when not swept
+    "n_episodes": N_EPISODES,
+    "q_table_dtype": Q_TABLE_DTYPE,
+}
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def run_key(params: dict, seed: int) -> str:
+    return json.dumps({"params": params, "seed": seed}, sort_keys=True)
+
+
+def config_value(name: str, value):
+    """
+    A swept value as the type of its Config field, e.g. "spread" or 1 for
+    the FireModel of `fire_model`. Values stay plain in the results file.
+    """
+    from envs.constants import Config
+
+    field_type = Config.__dataclass_fields__[name].type
+    if not (isinstance(field_type, type) and issubclass(field_type, Enum)):
+        return value
+    if isinstance(value, field_type):
+        return value
+    if isinstance(value, str) and value.upper() in field_type.__members__:
+        return field_type[value.upper()]
+    try:
+        return field_type(value)
+    except ValueError:
+        raise Exception(
+            f"{name}={value!r} is not one of {list(field_type.__members__)}"
+        )
+
+
+def run_config(params: dict, seed: int) -> dict:
+    """
+    Trains one agent from scratch with `params` and returns its summary.
+    Config overrides only go into this run's own Config instance.
+    """
+    from envs.constants import Config
+    from envs.grid_world import FireFighterWorld
+    from q_learning.agent import Agent
+
+    agent_params = {**AGENT_PARAMETERS}
+    config_params = {"is_rendering": False}
+    for name, value in params.items():
+        if name in agent_params:
+            agent_params[name] = value
+        elif name in Config.__dataclass_fields__:
+            config_params[name] = config_value(name, value)
+        else:
+            raise Exception(f"Parameter {name} not found")
+    config = Config(**config_params)
+
+    n_episodes = agent_params.pop("n_episodes")
+    if agent_params["epsilon_decay"] is None:
+        agent_params["epsilon_decay"] = (
+            agent_params["initial_epsilon"] - agent_params["final_epsilon"]
+        ) / (n_episodes * 0.8)
+
+    env = FireFighterWorld(
+        static_mode=True, observation_mode="discrete", config=config
+    )
+    options = {"preset_fire_positions": PRESET_FIRE_POSITIONS}
+    observation, _ = env.reset(seed=seed, options=options)
+    agent = Agent(
+        **agent_params,
+        debug=False,
+        config=config,
+        np_random=env.random_streams["exploration"],
+        q_table_file=None,
+    )
+
+    started = time.perf_counter()
+    rewards = np.zeros(n_episodes)
+    deaths = np.zeros(n_episodes, dtype=bool)
+    rescues = np.zeros(n_episodes, dtype=bool)
+
+    for episode in range(n_episodes):
+        for _ in range(MAX_STEPS_PER_EPISODE):
+            action = agent.get_action(env.action_space, observation)
+            next_observation, reward, terminated, _, info = env.step(action)
+            agent.update(observation, action, reward, terminated, next_observation)
+            observation = next_observation
+            rewards[episode] += reward
+
+            if terminated:
+                deaths[episode] = info["is_agent_dead"]
+                rescues[episode] = not info["is_agent_dead"]
+                break
+
+        agent.decay_epsilon()
+        observation, _ = env.reset(options=options)
+
+    env.close()
+
+    # judge the run by its last 10% of episodes, when exploration is low
+    last = slice(-max(1, n_episodes // 10), None)
+    return {
+        "params": params,
+        "seed": seed,
+        "mean_reward": float(rewards[last].mean()),
+        "death_rate": float(deaths[last].mean()),
+        "rescue_rate": float(rescues[last].mean()),
+        "duration": time.perf_counter() - started,
+    }
+
+
+class Sweep:
+    """
+    Trains one agent per point of a parameter grid on a process pool and
+    appends each result to a JSON lines file as soon as it is finished.
+    Runs already in the file are skipped, so an interrupted sweep picks up
+    where it stopped when started again. A failing run is reported and left
+    out of the file, the other runs go on and it is retried next time.
+    """
+
+    def __init__(
+        self,
+        grid: dict[str, list] = PARAMETER_GRID,
+        results_file=SWEEP_RESULTS_FILE,
+        workers=None,
+        seeds=(42,),
+    ):
+        self.runs = [(params, seed) for params in expand_grid(grid) for seed in seeds]
+        self.results_file = results_file
+        self.workers = workers or os.cpu_count()
+
+    def finished_keys(self) -> set[str]:
+        if not os.path.exists(self.results_file):
+            return set()
+
+        with open(self.results_file) as file:
+            return {
+                run_key(result["params"], result["seed"])
+                for result in map(json.loads, filter(str.strip, file))
+            }
+
+    def run(self) -> list[dict]:
+        finished = self.finished_keys()
+        pending = [
+            (params, seed)
+            for params, seed in self.runs
+            if run_key(params, seed) not in finished
+        ]
+        print(
+            f"Sweep: {len(pending)} of {len(self.runs)} runs left "
+            f"on {self.workers} workers"
+        )
+
+        results = []
+        failed = []
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=mp.get_context("spawn")
+        ) as pool, open(self.results_file, "a") as file:
+            futures = {
+                pool.submit(run_config, params, seed): (params, seed)
+                for params, seed in pending
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    result = future.result()
+                except Exception as error:
+                    params, seed = futures[future]
+                    failed.append((params, seed, error))
+                    print(
+                        f"[{done}/{len(pending)}] {params} seed {seed} "
+                        f"failed: {error!r}"
+                    )
+                    continue
+
+                file.write(json.dumps(result) + "\n")
+                file.flush()
+                results.append(result)
+
+                print(
+                    f"[{done}/{len(pending)}] {result['params']}: "
+                    f"reward {result['mean_reward']:.2f}, "
+                    f"rescued {result['rescue_rate']:.0%}"
+                )
+
+        if failed:
+            print(f"{len(failed)} runs failed, run the sweep again to retry them")
+
+        return results
+
+
+if __name__ == "__main__":
+    try:
+        Sweep().run()
+    except KeyboardInterrupt:
+        print("Sweep interrupted, finished runs are kept")
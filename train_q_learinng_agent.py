@@ -3,7 +3,6 @@ from q_learning.agent import Agent
 from q_learning.constants import N_EPISODES, RENDER, MAX_STEPS_PER_EPISODE
 from q_learning.metrics import Metrics
 from envs.constants import config
-from envs.ui.sprites import load_srpite_map
 
 
 def create_env():
@@ -12,16 +11,19 @@ def create_env():
         entry_point="envs:FireFighterWorld",
     )
 
-    env = gym.make("FireFighterWorld", render_mode="human" if RENDER else "rgb_array")
+    env = gym.make(
+        "FireFighterWorld",
+        render_mode="human" if RENDER else None,
+        config=config,
+    )
     env.reset(seed=42, options={"preset_fire_positions": [(3, 2)]})
 
     return env
 
 
-config.static_fire_mode = True
-# config.random_target_location = False
-load_srpite_map()
-agent = Agent()
+config = config.replace(static_fire_mode=True)
+# config = config.replace(random_target_location=False)
+agent = Agent(config=config)
 metrics = Metrics()
 
 preset_fire_positions = [
@@ -33,6 +35,7 @@ preset_fire_positions = [
 
 def run():
     env = create_env()
+    agent.np_random = env.unwrapped.random_streams["exploration"]
     observation, _ = env.reset(options={"preset_fire_positions": preset_fire_positions})
 
     for _ in range(N_EPISODES):